@@ -0,0 +1,223 @@
+"""
+ASGI entry point of the API, for deployments with many concurrent or slow
+clients. Run it from the repository root, for example:
+
+    uvicorn api.asgi:app --workers 4
+
+Every request is answered by the same Flask app, so routes, headers and error
+shapes are identical to the WSGI deployment. Handlers run on a thread pool
+against the shared in-memory index, while the event loop owns the sockets, so
+a slow client only holds a cheap coroutine instead of a worker thread, and
+files from `database/` are read chunk by chunk without blocking the loop.
+"""
+
+# pylint: disable=import-error
+
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, Iterable, Iterator, Union
+
+from werkzeug.wsgi import FileWrapper
+
+from api.index import app as wsgi_app
+from api.index import get_build, get_database
+
+THREADS = int(os.getenv("ANIMEAPI_ASGI_THREADS", "16"))
+"""Size of the thread pool running Flask handlers"""
+
+INLINE_MAX = 1 << 20
+"""Bodies up to this size are joined on the handler thread and sent at once"""
+
+FILE_CHUNK = 1 << 18
+"""Bytes read from a file per trip to the thread pool"""
+
+executor = ThreadPoolExecutor(max_workers=THREADS, thread_name_prefix="animeapi")
+
+Scope = dict[str, Any]
+Message = dict[str, Any]
+Receive = Callable[[], Any]
+Send = Callable[[Message], Any]
+
+
+class AsyncFileWrapper(FileWrapper):
+    """
+    `wsgi.file_wrapper` handed to Flask's `send_file`, marking file bodies the
+    event loop streams itself instead of iterating them on a pool thread
+    """
+
+
+def build_environ(scope: Scope, body: bytes) -> dict[str, Any]:
+    """Build a WSGI environ from an ASGI HTTP scope
+
+    Args:
+        scope (Scope): ASGI scope
+        body (bytes): Request body
+
+    Returns:
+        dict[str, Any]: WSGI environ
+    """
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ: dict[str, Any] = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+        "wsgi.file_wrapper": AsyncFileWrapper,
+    }
+    for raw_name, raw_value in scope["headers"]:
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def call_wsgi(environ: dict[str, Any]) -> tuple[int, list[tuple[bytes, bytes]], Iterable[bytes]]:
+    """Call the Flask app, meant to run on the thread pool
+
+    Args:
+        environ (dict[str, Any]): WSGI environ
+
+    Returns:
+        tuple[int, list[tuple[bytes, bytes]], Iterable[bytes]]: Status code,
+            headers, and body iterable
+    """
+    started: list[Any] = []
+
+    def start_response(status: str, headers: list[tuple[str, str]], exc_info: Any = None):
+        started[:] = [status, headers]
+
+    result: Iterable[bytes] = wsgi_app(environ, start_response)
+    status, headers = started
+    length = next((value for name, value in headers if name.lower() == "content-length"), None)
+    # lookups are rendered in memory, join them here instead of hopping back
+    # to the pool once per chunk
+    if not isinstance(result, AsyncFileWrapper) and length is not None and int(length) <= INLINE_MAX:
+        body = result
+        try:
+            result = [b"".join(body)]
+        finally:
+            close = getattr(body, "close", None)
+            if close is not None:
+                close()
+    return (
+        int(status.split(" ", 1)[0]),
+        [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+        result,
+    )
+
+
+async def read_body(receive: Receive) -> bytes:
+    """Read the whole request body
+
+    Args:
+        receive (Receive): ASGI receive callable
+
+    Returns:
+        bytes: Request body
+    """
+    chunks: list[bytes] = []
+    more = True
+    while more:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+async def stream_body(send: Send, result: Iterable[bytes]) -> None:
+    """Send a response body, reading files and lazy iterables on the thread
+    pool one chunk at a time
+
+    Args:
+        send (Send): ASGI send callable
+        result (Iterable[bytes]): WSGI body iterable
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        if isinstance(result, list):
+            await send({"type": "http.response.body", "body": b"".join(result)})
+            return
+        if isinstance(result, AsyncFileWrapper):
+            file_ = result.file
+            size = max(result.buffer_size, FILE_CHUNK)
+            next_chunk: Callable[[], bytes] = lambda: file_.read(size)
+        else:
+            iterator: Iterator[bytes] = iter(result)
+            next_chunk = lambda: next(iterator, b"")
+        while True:
+            chunk = await loop.run_in_executor(executor, next_chunk)
+            if not chunk:
+                break
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        close: Union[Callable[[], None], None] = getattr(result, "close", None)
+        if close is not None:
+            close()
+
+
+async def lifespan(receive: Receive, send: Send) -> None:
+    """Handle ASGI lifespan events, loading the index before serving
+
+    Args:
+        receive (Receive): ASGI receive callable
+        send (Send): ASGI send callable
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                await loop.run_in_executor(executor, get_database)
+                await loop.run_in_executor(executor, get_build)
+            except FileNotFoundError:
+                # served as errors by the routes, same as the WSGI app
+                pass
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope: Scope, receive: Receive, send: Send) -> None:
+    """ASGI application
+
+    Args:
+        scope (Scope): ASGI scope
+        receive (Receive): ASGI receive callable
+        send (Send): ASGI send callable
+    """
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+    body = await read_body(receive)
+    loop = asyncio.get_running_loop()
+    status, headers, result = await loop.run_in_executor(
+        executor, call_wsgi, build_environ(scope, body)
+    )
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await stream_body(send, result)
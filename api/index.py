@@ -2,20 +2,37 @@
 
 # pylint: disable=import-error
 
+import gc
+import hashlib
 import json
+import mmap
+import os
+import re
+import sqlite3
+import struct
+import sys
+import unicodedata
+from array import array
+from collections import Counter, OrderedDict
 from datetime import datetime as dtime
 from datetime import timezone as tz
-from time import time
-from typing import Any, TypedDict, Union
+from functools import lru_cache
+from heapq import nsmallest
+from itertools import accumulate
+from threading import Lock, Thread, local
+from time import perf_counter, time
+from typing import Any, Iterator, TypedDict, Union
 from urllib.parse import unquote
 
 from flask import (
     Flask,
     Response,
     g,
+    has_request_context,
     jsonify,
     redirect,
     request,
+    send_file,
     send_from_directory,  # type: ignore
 )
 from werkzeug.wrappers import Response as wzResponse
@@ -24,6 +41,70 @@ app = Flask(__name__)
 
 runtime = time()
 
+BULK_MAX_IDS = 1000
+"""Maximum number of IDs a single bulk lookup may translate"""
+
+RECORD_FIELDS = [
+    "anidb", "anilist", "animeplanet", "anisearch", "annict", "imdb", "kaize",
+    "kaize_id", "kitsu", "livechart", "myanimelist", "nautiljon", "nautiljon_id",
+    "notify", "otakotaku", "shikimori", "shoboi", "silveryasha", "themoviedb",
+    "title", "trakt", "trakt_season", "trakt_type",
+]
+"""Keys of every record, in the sorted order of their serialized bytes"""
+
+EXPORT_CHUNK = 1 << 16
+"""Bytes of records gathered into each chunk of a streamed export"""
+
+SQLITE_BATCH = 1000
+"""Records fetched per query when the SQLite backend iterates every record"""
+
+JSON_VALUE = re.compile(rb'"(?:[^"\\]|\\.)*"|[^,}]*')
+"""Scalar JSON value, as found in serialized records"""
+
+SEARCH_MAX_RESULTS = 50
+"""Maximum number of results a title search may return"""
+
+NON_WORD = re.compile(r"[\W_]+")
+"""Runs of characters other than letters and digits, ignored by searches and
+completions"""
+
+COMPLETION_INDEXES = ["title", "animeplanet", "kaize", "nautiljon", "notify"]
+"""Prefix completion indexes written by the generator, titles and slug-keyed
+platforms"""
+
+COMPLETE_MAX_RESULTS = 50
+"""Maximum number of results a prefix completion may return"""
+
+CACHE_MAX_AGE = int(os.getenv("ANIMEAPI_CACHE_MAX_AGE", "3600"))
+"""`Cache-Control` max-age, in seconds, of successful data responses"""
+
+LOCAL_EXPORTS = os.getenv("ANIMEAPI_LOCAL_EXPORTS", "").lower() in ["1", "true", "yes"]
+"""Serve `animeapi.json` and the per-platform JSON files from `database/` instead
+of redirecting to GitHub, for hosts without a response size limit"""
+
+CACHEABLE_ENDPOINTS = {
+    "platform_lookup", "trakt_exclusive_route", "tmdb_exclusive_route",
+    "status", "schema_json", "updated", "platform_array", "search_route",
+    "complete_route", "export_route",
+}
+"""Endpoints answering with validators and `Cache-Control`, `platform_array`
+only for the TSV file"""
+
+BACKEND = os.getenv("ANIMEAPI_BACKEND", "auto").lower()
+"""Lookup backend: `json` for the row store built from animeapi.json, `mmap` for
+the binary artifacts written by the generator, `sqlite` for animeapi.sqlite, or
+`auto` to use `mmap` when its artifacts exist"""
+
+STATUS_PATH = "api/status.json"
+"""Status file of the served build, rewritten by the generator after every
+other database file"""
+
+RELOAD_INTERVAL = float(os.getenv("ANIMEAPI_RELOAD_INTERVAL", "10"))
+"""Minimum seconds between checks for a new build, `0` disables hot reload"""
+
+RESPONSE_CACHE_SIZE = int(os.getenv("ANIMEAPI_RESPONSE_CACHE_SIZE", "4096"))
+"""Lookups and redirects kept by the LRU response cache, `0` disables it"""
+
 
 class CorruptedResp(TypedDict):
     error: str
@@ -31,32 +112,1564 @@ class CorruptedResp(TypedDict):
     message: str
 
 
-def platform_id_content(platform: str, platform_id: Union[int, str]) -> dict[str, Any]:
-    """Get content of platform ID
+PLATFORMS = (
+    "anidb", "anilist", "animeplanet", "anisearch", "annict", "imdb", "kaize",
+    "kitsu", "livechart", "myanimelist", "nautiljon", "notify", "otakotaku",
+    "shikimori", "shoboi", "silveryasha", "trakt", "themoviedb",
+)
+"""Platforms that can be looked up by ID, same as the generator's object files"""
+
+
+class PlatformNotFoundError(LookupError):
+    """Raised when a platform has no ID index in the database"""
+
+
+def platform_keys(platform: str, record: dict[str, Any]) -> list[str]:
+    """Get the IDs a record is keyed by on a platform, following the same rules
+    the generator uses to write `database/{platform}_object.json`
 
     Args:
         platform (str): Platform name
-        platform_id (int): Platform ID
+        record (dict[str, Any]): Record
 
     Returns:
-        dict[str, Any]: Platform ID content
+        list[str]: Keys, empty if the record is not on the platform
+    """
+    value = record.get(platform)
+    if value is None:
+        return []
+    if platform == "themoviedb":
+        return [f"movie/{value}"]
+    if platform != "trakt":
+        return [str(value)]
+    media_type = record["trakt_type"]
+    if media_type in ["movie", "movies"]:
+        return [f"{media_type}/{value}"]
+    keys = [f"{media_type}/{value}/seasons/{record['trakt_season']}"]
+    if record["trakt_season"] == 1:
+        keys.insert(0, f"{media_type}/{value}")
+    return keys
+
+
+def serialize_record(item: dict[str, Any]) -> bytes:
+    """Serialize a record exactly like a `jsonify` response body, the same way
+    the generator pre-serializes records in its binary and SQLite artifacts
+
+    Args:
+        item (dict[str, Any]): Record
+
+    Returns:
+        bytes: JSON bytes, newline terminated
+    """
+    return json.dumps(item, sort_keys=True, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class DatabaseIndex:
+    """
+    Process-wide lookup index built once from `database/animeapi.json`.
+
+    Records are serialized once at build time into a single bytes blob with an
+    array of offsets, and each platform only keeps a map of its IDs to row
+    numbers, instead of a full copy of the records like the `*_object.json`
+    files do. Few, large objects also stay shared between pre-forked workers,
+    as serving a lookup does not write to their pages.
+    """
+
+    backend = "json"
+
+    __slots__ = ("blob", "offsets", "keys")
+
+    def __init__(self, data: list[dict[str, Any]]) -> None:
+        # the generator writes object files from title-sorted data, and the
+        # last record wins on duplicate IDs, so index in that order too, which
+        # also numbers rows the same as its binary and SQLite artifacts
+        data = sorted(data, key=lambda item: item["title"])
+        rendered = [serialize_record(item) for item in data]
+        self.blob = b"".join(rendered)
+        self.offsets = array("Q", accumulate((len(record) for record in rendered), initial=0))
+        self.keys: dict[str, dict[str, int]] = {plat: {} for plat in PLATFORMS}
+        for row, item in enumerate(data):
+            for plat, ids in self.keys.items():
+                for key in platform_keys(plat, item):
+                    ids[key] = row
+
+    @classmethod
+    def from_file(cls, path: str) -> "DatabaseIndex":
+        """Build the index from a JSON array of records
+
+        Args:
+            path (str): Path to the JSON file
+
+        Raises:
+            FileNotFoundError: File does not exist
+
+        Returns:
+            DatabaseIndex: Index
+        """
+        with open(path, "r", encoding="utf-8") as file_:
+            return cls(json.loads(file_.read()))
+
+    def row(self, platform: str, platform_id: str) -> int:
+        """Find the row of a platform ID
+
+        Args:
+            platform (str): Platform name
+            platform_id (str): Platform ID, keyed like in the object files
+
+        Raises:
+            PlatformNotFoundError: Platform is not indexed
+            KeyError: ID does not exist on the platform
+
+        Returns:
+            int: Row number
+        """
+        try:
+            ids = self.keys[platform]
+        except KeyError:
+            raise PlatformNotFoundError(platform) from None
+        return ids[platform_id]
+
+    def get(self, platform: str, platform_id: str) -> dict[str, Any]:
+        """Get a record by platform and ID
+
+        Args:
+            platform (str): Platform name
+            platform_id (str): Platform ID, keyed like in the object files
+
+        Raises:
+            PlatformNotFoundError: Platform is not indexed
+            KeyError: ID does not exist on the platform
+
+        Returns:
+            dict[str, Any]: Record
+        """
+        return json.loads(self.get_bytes(platform, platform_id))
+
+    def get_bytes(self, platform: str, platform_id: str) -> bytes:
+        """Get the pre-serialized JSON bytes of a record by platform and ID
+
+        Args:
+            platform (str): Platform name
+            platform_id (str): Platform ID, keyed like in the object files
+
+        Raises:
+            PlatformNotFoundError: Platform is not indexed
+            KeyError: ID does not exist on the platform
+
+        Returns:
+            bytes: Record, serialized like a `jsonify` response body
+        """
+        return self.record(self.row(platform, platform_id))
+
+    def record(self, row: int) -> bytes:
+        """Get the pre-serialized JSON bytes of a record
+
+        Args:
+            row (int): Row number
+
+        Returns:
+            bytes: Record, serialized like a `jsonify` response body
+        """
+        return self.blob[self.offsets[row]:self.offsets[row + 1]]
+
+    def titles(self) -> list[str]:
+        """Get the title of every record
+
+        Returns:
+            list[str]: Titles, in row order
+        """
+        return [json.loads(self.record(row))["title"] for row in range(len(self.offsets) - 1)]
+
+    def iter_records(self) -> Iterator[bytes]:
+        """Iterate over every pre-serialized record
+
+        Yields:
+            bytes: Record, in row order
+        """
+        for row in range(len(self.offsets) - 1):
+            yield self.record(row)
+
+
+BINARY_MAGIC = b"ANIMEAPI"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<8sII")
+"""Binary lookup file header: magic, version, and entry count, see
+`generator/dumper.py` for the file layout"""
+
+
+def map_binary_file(path: str) -> tuple[mmap.mmap, int]:
+    """Memory-map a binary lookup file written by the generator
+
+    Args:
+        path (str): Path to the file
+
+    Raises:
+        FileNotFoundError: File does not exist
+        ValueError: File is not a binary lookup file of a supported version
+
+    Returns:
+        tuple[mmap.mmap, int]: Mapped file and its entry count
+    """
+    with open(path, "rb") as file_:
+        mapped = mmap.mmap(file_.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, count = BINARY_HEADER.unpack_from(mapped)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        mapped.close()
+        raise ValueError(f"{path} is not a supported binary lookup file")
+    return mapped, count
+
+
+class MmapDatabase:
+    """
+    Lookup index over the memory-mapped binary artifacts of the generator,
+    `database/animeapi.bin` for pre-serialized records and
+    `database/{platform}.bin` for each platform's sorted IDs.
+
+    Lookups binary search the mapped keys and slice the record bytes, so no
+    record is parsed until it is requested, and forked workers share the same
+    pages through the OS page cache.
+    """
+
+    backend = "mmap"
+
+    __slots__ = ("records", "count", "platforms")
+
+    def __init__(self, path: str = "database") -> None:
+        self.records, self.count = map_binary_file(f"{path}/animeapi.bin")
+        self.platforms: dict[str, tuple[mmap.mmap, int]] = {
+            plat: map_binary_file(f"{path}/{plat}.bin") for plat in PLATFORMS
+        }
+
+    def row(self, platform: str, platform_id: str) -> int:
+        """Find the record row of a platform ID
+
+        Args:
+            platform (str): Platform name
+            platform_id (str): Platform ID, keyed like in the object files
+
+        Raises:
+            PlatformNotFoundError: Platform is not indexed
+            KeyError: ID does not exist on the platform
+
+        Returns:
+            int: Row number in `database/animeapi.bin`
+        """
+        try:
+            mapped, count = self.platforms[platform]
+        except KeyError:
+            raise PlatformNotFoundError(platform) from None
+        needle = platform_id.encode("utf-8")
+        offsets = BINARY_HEADER.size
+        rows = offsets + 4 * (count + 1)
+        keys = rows + 4 * count
+        low, high = 0, count
+        while low < high:
+            mid = (low + high) // 2
+            start, end = struct.unpack_from("<II", mapped, offsets + 4 * mid)
+            key = mapped[keys + start:keys + end]
+            if key < needle:
+                low = mid + 1
+            elif key > needle:
+                high = mid
+            else:
+                return struct.unpack_from("<I", mapped, rows + 4 * mid)[0]
+        raise KeyError(platform_id)
+
+    def record(self, row: int) -> bytes:
+        """Get the pre-serialized JSON bytes of a record
+
+        Args:
+            row (int): Row number
+
+        Returns:
+            bytes: Record, serialized like a `jsonify` response body
+        """
+        start, end = struct.unpack_from(
+            "<II", self.records, BINARY_HEADER.size + 4 * row
+        )
+        blob = BINARY_HEADER.size + 4 * (self.count + 1)
+        return self.records[blob + start:blob + end]
+
+    def titles(self) -> list[str]:
+        """Get the title of every record
+
+        Returns:
+            list[str]: Titles, in row order
+        """
+        return [json.loads(self.record(row))["title"] for row in range(self.count)]
+
+    def iter_records(self) -> Iterator[bytes]:
+        """Iterate over every pre-serialized record
+
+        Yields:
+            bytes: Record, in row order
+        """
+        for row in range(self.count):
+            yield self.record(row)
+
+    def get(self, platform: str, platform_id: str) -> dict[str, Any]:
+        """Get a record by platform and ID
+
+        Args:
+            platform (str): Platform name
+            platform_id (str): Platform ID, keyed like in the object files
+
+        Raises:
+            PlatformNotFoundError: Platform is not indexed
+            KeyError: ID does not exist on the platform
+
+        Returns:
+            dict[str, Any]: Record
+        """
+        return json.loads(self.get_bytes(platform, platform_id))
+
+    def get_bytes(self, platform: str, platform_id: str) -> bytes:
+        """Get the pre-serialized JSON bytes of a record by platform and ID
+
+        Args:
+            platform (str): Platform name
+            platform_id (str): Platform ID, keyed like in the object files
+
+        Raises:
+            PlatformNotFoundError: Platform is not indexed
+            KeyError: ID does not exist on the platform
+
+        Returns:
+            bytes: Record, serialized like a `jsonify` response body
+        """
+        return self.record(self.row(platform, platform_id))
+
+
+def sqlite_key_clause(platform: str, platform_id: str) -> tuple[str, tuple[str, ...]]:
+    """Translate an object file key to a `WHERE` clause on the `anime` table
+
+    Args:
+        platform (str): Platform name
+        platform_id (str): Platform ID, keyed like in the object files
+
+    Raises:
+        KeyError: Key can not exist on the platform
+
+    Returns:
+        tuple[str, tuple[str, ...]]: Clause and its parameters
+    """
+    if platform == "themoviedb":
+        media_type, _, media_id = platform_id.partition("/")
+        if media_type != "movie" or not media_id:
+            raise KeyError(platform_id)
+        return "themoviedb = ?", (media_id,)
+    if platform != "trakt":
+        return f'"{platform}" = ?', (platform_id,)
+    parts = platform_id.split("/")
+    is_movie = parts[0] in ["movie", "movies"]
+    if len(parts) == 2 and is_movie:
+        return "trakt_type = ? AND trakt = ?", (parts[0], parts[1])
+    if len(parts) == 2:
+        return "trakt_type = ? AND trakt = ? AND trakt_season = '1'", (parts[0], parts[1])
+    if len(parts) == 4 and parts[2] == "seasons" and not is_movie:
+        return (
+            "trakt_type = ? AND trakt = ? AND trakt_season = ?",
+            (parts[0], parts[1], parts[3]),
+        )
+    raise KeyError(platform_id)
+
+
+class SqliteDatabase:
+    """
+    Lookup index over `database/animeapi.sqlite`, queried through a read-only
+    connection per thread, so workers keep no records in memory and the
+    indexed columns answer each lookup.
+    """
+
+    backend = "sqlite"
+
+    __slots__ = ("path", "_local")
+
+    def __init__(self, path: str = "database/animeapi.sqlite") -> None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self._local = local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Read-only connection of the current thread"""
+        conn: Union[sqlite3.Connection, None] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def select(self, column: str, platform: str, platform_id: str) -> Any:
+        """Select a column of the record of a platform ID
+
+        Args:
+            column (str): Column name
+            platform (str): Platform name
+            platform_id (str): Platform ID, keyed like in the object files
+
+        Raises:
+            PlatformNotFoundError: Platform is not indexed
+            KeyError: ID does not exist on the platform
+
+        Returns:
+            Any: Value
+        """
+        if platform not in PLATFORMS:
+            raise PlatformNotFoundError(platform)
+        clause, params = sqlite_key_clause(platform, platform_id)
+        # rows follow title order, the last one wins like in the object files
+        found = self.connection.execute(
+            f"SELECT {column} FROM anime WHERE {clause} ORDER BY row DESC LIMIT 1",
+            params,
+        ).fetchone()
+        if found is None:
+            raise KeyError(platform_id)
+        return found[0]
+
+    def row(self, platform: str, platform_id: str) -> int:
+        """Find the row of a platform ID
+
+        Args:
+            platform (str): Platform name
+            platform_id (str): Platform ID, keyed like in the object files
+
+        Raises:
+            PlatformNotFoundError: Platform is not indexed
+            KeyError: ID does not exist on the platform
+
+        Returns:
+            int: Row number
+        """
+        return self.select("row", platform, platform_id)
+
+    def get(self, platform: str, platform_id: str) -> dict[str, Any]:
+        """Get a record by platform and ID
+
+        Args:
+            platform (str): Platform name
+            platform_id (str): Platform ID, keyed like in the object files
+
+        Raises:
+            PlatformNotFoundError: Platform is not indexed
+            KeyError: ID does not exist on the platform
+
+        Returns:
+            dict[str, Any]: Record
+        """
+        return json.loads(self.get_bytes(platform, platform_id))
+
+    def get_bytes(self, platform: str, platform_id: str) -> bytes:
+        """Get the pre-serialized JSON bytes of a record by platform and ID
+
+        Args:
+            platform (str): Platform name
+            platform_id (str): Platform ID, keyed like in the object files
+
+        Raises:
+            PlatformNotFoundError: Platform is not indexed
+            KeyError: ID does not exist on the platform
+
+        Returns:
+            bytes: Record, serialized like a `jsonify` response body
+        """
+        return self.select("record", platform, platform_id)
+
+    def record(self, row: int) -> bytes:
+        """Get the pre-serialized JSON bytes of a record
+
+        Args:
+            row (int): Row number
+
+        Returns:
+            bytes: Record, serialized like a `jsonify` response body
+        """
+        return self.connection.execute(
+            "SELECT record FROM anime WHERE row = ?", (row,)
+        ).fetchone()[0]
+
+    def titles(self) -> list[str]:
+        """Get the title of every record
+
+        Returns:
+            list[str]: Titles, in row order
+        """
+        return [title for (title,) in self.connection.execute("SELECT title FROM anime ORDER BY row")]
+
+    def iter_records(self) -> Iterator[bytes]:
+        """Iterate over every pre-serialized record, fetched in batches so a
+        consumer resuming on another thread uses that thread's connection
+
+        Yields:
+            bytes: Record, in row order
+        """
+        row = 0
+        while True:
+            batch = self.connection.execute(
+                "SELECT record FROM anime WHERE row >= ? ORDER BY row LIMIT ?",
+                (row, SQLITE_BATCH),
+            ).fetchall()
+            for (record,) in batch:
+                yield record
+            if len(batch) < SQLITE_BATCH:
+                return
+            row += len(batch)
+
+
+Database = Union[DatabaseIndex, MmapDatabase, SqliteDatabase]
+"""Any of the lookup backends"""
+
+
+class RedirectTable:
+    """
+    Redirect URIs precomputed by the generator in `database/redirect.bin`, one
+    row per record, numbered like the database rows, holding the record's URI
+    on every target, or an empty string where it has none
+    """
+
+    __slots__ = ("mapped", "count", "columns")
+
+    def __init__(self, path: str = "database/redirect.bin") -> None:
+        self.mapped, count = map_binary_file(path)
+        # the extra last row names the target of each column
+        self.count = count - 1
+        self.columns: dict[str, int] = {
+            target: column
+            for column, target in enumerate(self.record(self.count).decode("utf-8").split("\t"))
+        }
+
+    def record(self, row: int) -> bytes:
+        """Get the raw row of tab-separated URIs
+
+        Args:
+            row (int): Row number
+
+        Returns:
+            bytes: Row
+        """
+        start, end = struct.unpack_from("<II", self.mapped, BINARY_HEADER.size + 4 * row)
+        blob = BINARY_HEADER.size + 4 * (self.count + 2)
+        return self.mapped[blob + start:blob + end]
+
+    def uri(self, row: int, target: str) -> str:
+        """Get the URI of a database row on a target
+
+        Args:
+            row (int): Row number
+            target (str): Target platform
+
+        Raises:
+            KeyError: Target has no column in the table
+
+        Returns:
+            str: URI, empty if the record is not on the target
+        """
+        column = self.columns[target]
+        return self.record(row).decode("utf-8").split("\t")[column]
+
+
+def load_redirects() -> Union[RedirectTable, None]:
+    """Load the precomputed redirect table, if the generator wrote one
+
+    Returns:
+        Union[RedirectTable, None]: Redirect table, or None to build redirect
+            URIs from records instead
+    """
+    try:
+        return RedirectTable()
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def search_terms(text: str) -> str:
+    """Normalize text for searching: width and case folded, with anything other
+    than letters and digits turned into single spaces
+
+    Args:
+        text (str): Text
+
+    Returns:
+        str: Normalized text
+    """
+    return " ".join(NON_WORD.split(unicodedata.normalize("NFKC", text).casefold())).strip()
+
+
+def trigrams(text: str) -> set[str]:
+    """Get the trigrams of normalized text, each word padded like `pg_trgm`
+    does, so short words and word starts still match
+
+    Args:
+        text (str): Normalized text
+
+    Returns:
+        set[str]: Trigrams
+    """
+    grams: set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[index:index + 3] for index in range(len(padded) - 2))
+    return grams
+
+
+class SearchIndex:
+    """
+    Trigram inverted index over the title of every database row, so a search
+    only counts the rows sharing trigrams with the query instead of scanning
+    every title
+    """
+
+    __slots__ = ("postings", "sizes")
+
+    def __init__(self, titles: list[str]) -> None:
+        postings: dict[str, list[int]] = {}
+        sizes = array("H")
+        for row, title in enumerate(titles):
+            grams = trigrams(search_terms(title))
+            sizes.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+        self.postings: dict[str, array] = {
+            gram: array("I", rows) for gram, rows in postings.items()
+        }
+        self.sizes = sizes
+
+    def search(self, query: str, limit: int) -> list[tuple[float, int]]:
+        """Rank rows by how much of the query their title covers, then by
+        trigram similarity, so shorter titles win among equal matches
+
+        Args:
+            query (str): Query
+            limit (int): Maximum number of results
+
+        Returns:
+            list[tuple[float, int]]: Similarity and row of each result
+        """
+        grams = trigrams(search_terms(query))
+        if not grams:
+            return []
+        shared: Counter[int] = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        # a title must share at least half of the query's trigrams
+        minimum = len(grams) / 2
+        ranked = [
+            (count / len(grams), count / (len(grams) + self.sizes[row] - count), row)
+            for row, count in shared.items()
+            if count >= minimum
+        ]
+        best = nsmallest(limit, ranked, key=lambda item: (-item[0], -item[1], item[2]))
+        return [(round(similarity, 4), row) for _, similarity, row in best]
+
+
+class CompletionIndex:
+    """
+    Prefix completion over the memory-mapped `database/complete_{name}.bin`,
+    laid out like `database/{platform}.bin` with titles or slugs normalized
+    by `search_terms`, so every key sharing a prefix is contiguous
+    """
+
+    __slots__ = ("mapped", "count")
+
+    def __init__(self, name: str, path: str = "database") -> None:
+        self.mapped, self.count = map_binary_file(f"{path}/complete_{name}.bin")
+
+    def key(self, index: int) -> bytes:
+        """Get a normalized key
+
+        Args:
+            index (int): Position in the sorted keys
+
+        Returns:
+            bytes: Key
+        """
+        offsets = BINARY_HEADER.size
+        keys = offsets + 8 * self.count + 4
+        start, end = struct.unpack_from("<II", self.mapped, offsets + 4 * index)
+        return self.mapped[keys + start:keys + end]
+
+    def complete(self, prefix: str, limit: int) -> list[int]:
+        """Find the rows whose key starts with a prefix, in key order
+
+        Args:
+            prefix (str): Prefix, normalized like the keys before matching
+            limit (int): Maximum number of results
+
+        Returns:
+            list[int]: Row numbers
+        """
+        needle = search_terms(prefix).encode("utf-8")
+        if not needle:
+            return []
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self.key(mid) < needle:
+                low = mid + 1
+            else:
+                high = mid
+        rows_at = BINARY_HEADER.size + 4 * (self.count + 1)
+        rows: list[int] = []
+        for index in range(low, self.count):
+            if len(rows) >= limit or not self.key(index).startswith(needle):
+                break
+            row = struct.unpack_from("<I", self.mapped, rows_at + 4 * index)[0]
+            if row not in rows:
+                rows.append(row)
+        return rows
+
+
+def load_completions() -> dict[str, CompletionIndex]:
+    """Load the prefix completion indexes the generator wrote
+
+    Returns:
+        dict[str, CompletionIndex]: Completion index by name, missing or
+            invalid ones left out
+    """
+    completions: dict[str, CompletionIndex] = {}
+    for name in COMPLETION_INDEXES:
+        try:
+            completions[name] = CompletionIndex(name)
+        except (FileNotFoundError, ValueError):
+            continue
+    return completions
+
+
+def load_database() -> Database:
+    """Build the database index of the configured `BACKEND`
+
+    Raises:
+        FileNotFoundError: Backend data files do not exist
+
+    Returns:
+        Database: Database index
+    """
+    if BACKEND == "sqlite":
+        return SqliteDatabase()
+    if BACKEND == "mmap" or (
+        BACKEND == "auto" and os.path.exists("database/animeapi.bin")
+    ):
+        return MmapDatabase()
+    return DatabaseIndex.from_file("database/animeapi.json")
+
+
+class Build:
+    """
+    Dataset build served by the API, read from `api/status.json`, and the
+    validators derived from it for conditional requests
+    """
+
+    __slots__ = ("status", "updated", "etag")
+
+    def __init__(self, raw: bytes) -> None:
+        self.status: dict[str, Any] = json.loads(raw)
+        self.updated = dtime.fromtimestamp(
+            self.status["updated"]["timestamp"], tz=tz.utc
+        )
+        # builds from before the generator wrote a content hash fall back to
+        # the hash of status.json, which changes on every build as well
+        self.etag: str = (
+            self.status["updated"].get("hash") or hashlib.sha256(raw).hexdigest()
+        )
+
+    @classmethod
+    def from_file(cls, path: str = STATUS_PATH) -> "Build":
+        """Read the build from a status file
+
+        Args:
+            path (str, optional): Path to the file. Defaults to "api/status.json".
+
+        Returns:
+            Build: Build
+        """
+        with open(path, "rb") as file_:
+            return cls(file_.read())
+
+
+def status_stamp() -> Union[tuple[int, int], None]:
+    """Identify the current `api/status.json` by modification time and inode,
+    the generator writes it last and replaces it atomically, so a new stamp
+    means a complete new build is on disk
+
+    Returns:
+        Union[tuple[int, int], None]: Stamp, or None if the file is missing
+    """
+    try:
+        stat = os.stat(STATUS_PATH)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_ino)
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache, counting its hits, misses, and
+    evictions in the process metrics under its name
+    """
+
+    __slots__ = ("name", "maxsize", "entries", "_lock")
+
+    def __init__(self, name: str, maxsize: int) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.entries: OrderedDict[Any, Any] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Any) -> Any:
+        """Get a cached value, marking it as recently used
+
+        Args:
+            key (Any): Key
+
+        Returns:
+            Any: Value, or None if it is not cached
+        """
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+        metrics.cache(self.name, value is not None)
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        """Cache a value, evicting the least recently used one when full
+
+        Args:
+            key (Any): Key
+            value (Any): Value, not None
+        """
+        if self.maxsize <= 0:
+            return
+        evicted = False
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                evicted = True
+        if evicted:
+            metrics.evicted(self.name)
+
+
+class Snapshot:
+    """
+    Build and database index served together. Both are loaded on first use,
+    and a hot reload swaps in a whole new snapshot, so requests that already
+    hold the previous one finish on it. Responses are cached per snapshot, so
+    a new build starts with an empty cache.
+    """
+
+    __slots__ = (
+        "stamp", "load_seconds", "loaded_at", "responses", "_build", "_database",
+        "_redirects", "_search", "_completions", "_memory_bytes", "_lock",
+    )
+
+    def __init__(self, stamp: Union[tuple[int, int], None]) -> None:
+        self.stamp = stamp
+        self.load_seconds: Union[float, None] = None
+        """Seconds it took to load the database index"""
+        self.loaded_at: Union[float, None] = None
+        """Epoch the database index finished loading at"""
+        self.responses = LRUCache("responses", RESPONSE_CACHE_SIZE)
+        """Lookup bodies and redirect URIs of this build, by normalized key"""
+        self._build: Union[Build, None] = None
+        self._database: Union[Database, None] = None
+        self._redirects: Union[RedirectTable, None] = None
+        self._search: Union[SearchIndex, None] = None
+        self._completions: Union[dict[str, CompletionIndex], None] = None
+        self._memory_bytes: Union[int, None] = None
+        self._lock = Lock()
+
+    @property
+    def build(self) -> Build:
+        """Dataset build, read from `api/status.json` on first use"""
+        if self._build is None:
+            with self._lock:
+                if self._build is None:
+                    self._build = Build.from_file(STATUS_PATH)
+        return self._build
+
+    @property
+    def database(self) -> Database:
+        """Database index of the configured `BACKEND`, built on first use
+
+        Raises:
+            FileNotFoundError: Backend data files do not exist
+        """
+        if self._database is None:
+            with self._lock:
+                # another thread may have built it while we were waiting
+                if self._database is None:
+                    start = perf_counter()
+                    self._redirects = load_redirects()
+                    self._database = load_database()
+                    self.load_seconds = perf_counter() - start
+                    self.loaded_at = time()
+        return self._database
+
+    @property
+    def redirects(self) -> Union[RedirectTable, None]:
+        """Redirect table matching the database rows, loaded with the database
+
+        Raises:
+            FileNotFoundError: Backend data files do not exist
+        """
+        _ = self.database
+        return self._redirects
+
+    @property
+    def search(self) -> SearchIndex:
+        """Trigram index over the titles of the database rows, built on first use
+
+        Raises:
+            FileNotFoundError: Backend data files do not exist
+        """
+        if self._search is None:
+            database = self.database
+            with self._lock:
+                if self._search is None:
+                    self._search = SearchIndex(database.titles())
+        return self._search
+
+    @property
+    def completions(self) -> dict[str, CompletionIndex]:
+        """Prefix completion indexes by name, mapped on first use"""
+        if self._completions is None:
+            with self._lock:
+                if self._completions is None:
+                    self._completions = load_completions()
+        return self._completions
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated memory of the database index, measured on first use
+
+        Raises:
+            FileNotFoundError: Backend data files do not exist
+        """
+        if self._memory_bytes is None:
+            self._memory_bytes = database_bytes(self.database)
+        return self._memory_bytes
+
+
+_snapshot: Union[Snapshot, None] = None
+_snapshot_lock = Lock()
+_reload_lock = Lock()
+_next_check = 0.0
+
+
+def reload_snapshot(stamp: Union[tuple[int, int], None]) -> None:
+    """Load a new snapshot and swap it in once its index is fully built, meant
+    to run in a background thread
+
+    Args:
+        stamp (Union[tuple[int, int], None]): Stamp of the new status file
+    """
+    global _snapshot  # pylint: disable=global-statement
+    try:
+        snapshot = Snapshot(stamp)
+        _ = snapshot.build, snapshot.database
+    except (OSError, ValueError, KeyError) as err:
+        # keep serving the current build, the next check retries
+        app.logger.warning("Reloading the database failed: %s", err)
+    else:
+        _snapshot = snapshot
+        app.logger.info("Reloaded the database in %.3fs", snapshot.load_seconds)
+    finally:
+        _reload_lock.release()
+
+
+def check_reload(snapshot: Snapshot) -> None:
+    """Start a background reload when `api/status.json` has changed, at most
+    once per `RELOAD_INTERVAL`
+
+    Args:
+        snapshot (Snapshot): Snapshot currently served
+    """
+    global _next_check  # pylint: disable=global-statement
+    now = time()
+    if now < _next_check:
+        return
+    _next_check = now + RELOAD_INTERVAL
+    stamp = status_stamp()
+    if stamp is None or stamp == snapshot.stamp:
+        return
+    # a reload already in progress will pick the newest build up next time
+    if not _reload_lock.acquire(blocking=False):
+        return
+    Thread(target=reload_snapshot, args=(stamp,), daemon=True).start()
+
+
+def get_snapshot() -> Snapshot:
+    """Get the snapshot of the current request, or of the process outside of
+    requests, checking for a new build as configured by `RELOAD_INTERVAL`
+
+    Returns:
+        Snapshot: Snapshot
+    """
+    global _snapshot  # pylint: disable=global-statement
+    if has_request_context() and "snapshot" in g:
+        return g.snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = Snapshot(status_stamp())
+    elif RELOAD_INTERVAL > 0:
+        check_reload(_snapshot)
+    return _snapshot
+
+
+def preload() -> None:
+    """Load the build, database index, redirect table, search index, and
+    completion indexes ahead of time, then
+    freeze every object allocated so far out of the garbage collector's reach
+
+    Pre-fork servers call this in the master before forking, see
+    `gunicorn.conf.py`, so workers share the loaded pages copy-on-write and
+    their collections never write to them.
+    """
+    snapshot = get_snapshot()
+    try:
+        _ = snapshot.build, snapshot.redirects, snapshot.search, snapshot.completions
+    except (OSError, ValueError) as err:
+        # workers load on first use and answer with errors meanwhile, as usual
+        app.logger.warning("Preloading the database failed: %s", err)
+    gc.collect()
+    gc.freeze()
+
+
+def get_database() -> Database:
+    """Get the database index of the served snapshot, building it on first use
+
+    Raises:
+        FileNotFoundError: Backend data files do not exist
+
+    Returns:
+        Database: Database index
+    """
+    return get_snapshot().database
+
+
+def get_build() -> Build:
+    """Get the dataset build of the served snapshot, reading it on first use
+
+    Returns:
+        Build: Build
+    """
+    return get_snapshot().build
+
+
+def clean_platform_id(platform_id: Union[int, str]) -> str:
+    """Strip file extensions and URL quoting from a requested platform ID
+
+    Args:
+        platform_id (Union[int, str]): Platform ID
+
+    Returns:
+        str: Platform ID
     """
     extensions_to_remove = [".json", ".html"]
     platform_id = str(platform_id)
     for extension in extensions_to_remove:
         platform_id = platform_id.replace(extension, "")
 
-    platform_id = unquote(platform_id)
+    return unquote(platform_id)
 
-    with open(f"database/{platform}_object.json", "r", encoding="utf-8") as file_:
-        data = json.loads(file_.read())
-    return data[str(platform_id)]
+
+def platform_id_content(platform: str, platform_id: Union[int, str]) -> dict[str, Any]:
+    """Get content of platform ID
+
+    Args:
+        platform (str): Platform name
+        platform_id (int): Platform ID
+
+    Returns:
+        dict[str, Any]: Platform ID content
+    """
+    return get_database().get(platform, clean_platform_id(platform_id))
+
+
+def platform_id_response(platform: str, platform_id: Union[int, str]) -> Response:
+    """Get content of platform ID as a JSON response, built straight from the
+    record's pre-serialized bytes instead of encoding it on every request, and
+    projected to the `fields` query parameter when given
+
+    Args:
+        platform (str): Platform name
+        platform_id (int): Platform ID
+
+    Returns:
+        Response: JSON response
+    """
+    fields = request.args.get("fields")
+    try:
+        tokens = None if fields is None else field_tokens(fields)
+    except ValueError as err:
+        return error_response("Invalid request", 400, str(err))
+    snapshot = get_snapshot()
+    key = (platform, clean_platform_id(platform_id))
+    data = snapshot.responses.get(key)
+    if data is None:
+        data = snapshot.database.get_bytes(*key)
+        snapshot.responses.put(key, data)
+    if tokens is not None:
+        data = project_record(data, tokens)
+    return Response(data, mimetype="application/json")
+
+
+@lru_cache(maxsize=256)
+def field_tokens(fields: str, parameter: str = "fields") -> tuple[bytes, ...]:
+    """Precompute the projection of a `fields` parameter, once per distinct
+    value: the serialized `"key":` token of each wanted key, in record order
+
+    Args:
+        fields (str): Comma-separated record keys
+        parameter (str, optional): Query parameter the keys come from, named
+            in errors. Defaults to "fields".
+
+    Raises:
+        ValueError: No key is given, or a key is not a record key
+
+    Returns:
+        tuple[bytes, ...]: Key tokens
+    """
+    wanted = {field.strip() for field in fields.split(",") if field.strip()}
+    if not wanted:
+        raise ValueError(f"`{parameter}` lists no keys")
+    unknown = sorted(wanted.difference(RECORD_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown keys in `{parameter}`: {', '.join(unknown)}")
+    return tuple(
+        json.dumps(field).encode("utf-8") + b":" for field in RECORD_FIELDS if field in wanted
+    )
+
+
+def project_record(record: bytes, tokens: tuple[bytes, ...]) -> bytes:
+    """Keep only the keys of a `field_tokens` projection, slicing the record
+    bytes instead of decoding and encoding it again
+
+    Quotes inside serialized strings are always escaped, so a key token can
+    only be found where the key itself is.
+
+    Args:
+        record (bytes): Pre-serialized record
+        tokens (tuple[bytes, ...]): Key tokens from `field_tokens`
+
+    Returns:
+        bytes: Projected record, serialized like a `jsonify` response body
+    """
+    pairs: list[bytes] = []
+    for token in tokens:
+        start = record.find(token)
+        if start >= 0:
+            pairs.append(record[start:JSON_VALUE.match(record, start + len(token)).end()])
+    return b"{" + b",".join(pairs) + b"}\n"
+
+
+def field_value(record: bytes, token: bytes) -> Union[bytes, None]:
+    """Get the serialized value of a key from a pre-serialized record
+
+    Args:
+        record (bytes): Pre-serialized record
+        token (bytes): Key token, as built by `field_tokens`
+
+    Returns:
+        Union[bytes, None]: Serialized value, or None if the key is absent
+    """
+    start = record.find(token)
+    if start < 0:
+        return None
+    match = JSON_VALUE.match(record, start + len(token))
+    return match.group()  # type: ignore
+
+
+class ExportFilter:
+    """
+    Conditions of an export on the serialized values of record keys, checked
+    on the pre-serialized records without decoding them
+    """
+
+    __slots__ = ("has", "missing", "equals")
+
+    def __init__(
+        self,
+        has: tuple[bytes, ...] = (),
+        missing: tuple[bytes, ...] = (),
+        equals: tuple[tuple[bytes, frozenset[bytes]], ...] = (),
+    ) -> None:
+        self.has = has
+        """Key tokens whose value must not be null"""
+        self.missing = missing
+        """Key tokens whose value must be null"""
+        self.equals = equals
+        """Key tokens and the serialized values they must have"""
+
+    @classmethod
+    def from_args(cls, args: Any) -> "ExportFilter":
+        """Build the filter of a request's query parameters: `has` and
+        `missing` take comma-separated keys, and any record key takes the
+        value it must equal
+
+        Args:
+            args (Any): Query parameters
+
+        Raises:
+            ValueError: `has` or `missing` lists no key, or a key is not a
+                record key
+
+        Returns:
+            ExportFilter: Filter
+        """
+        has = field_tokens(args["has"], "has") if "has" in args else ()
+        missing = field_tokens(args["missing"], "missing") if "missing" in args else ()
+        equals = tuple(
+            (
+                json.dumps(field).encode("utf-8") + b":",
+                frozenset([value.encode("utf-8"), json.dumps(value).encode("utf-8")]),
+            )
+            for field in RECORD_FIELDS
+            if (value := args.get(field)) is not None
+        )
+        return cls(has, missing, equals)
+
+    def matches(self, record: bytes) -> bool:
+        """Check a pre-serialized record against every condition
+
+        Args:
+            record (bytes): Pre-serialized record
+
+        Returns:
+            bool: True if the record is exported
+        """
+        for token in self.has:
+            if field_value(record, token) in (None, b"null"):
+                return False
+        for token in self.missing:
+            if field_value(record, token) not in (None, b"null"):
+                return False
+        for token, values in self.equals:
+            if field_value(record, token) not in values:
+                return False
+        return True
+
+
+def trakt_key(
+    media_type: str, media_id: Union[int, str], season_id: Union[str, None] = None
+) -> str:
+    """Build the database key of a Trakt entry
+
+    Args:
+        media_type (str): Media type, `movie(s)` or `show(s)`
+        media_id (Union[int, str]): Media ID
+        season_id (Union[str, None], optional): Season ID. Defaults to None.
+
+    Returns:
+        str: Key, such as `shows/152334/seasons/3`
+    """
+    if not media_type.endswith("s"):
+        media_type = f"{media_type}s"
+    if season_id is None:
+        return f"{media_type}/{media_id}"
+    return f"{media_type}/{media_id}/seasons/{season_id}"
+
+
+def lookup_key(platform: str, platform_id: str) -> str:
+    """Normalize a free-form ID to its database key, following the same rules
+    as the Trakt and The Movie Database exclusive routes
+
+    Args:
+        platform (str): Platform name
+        platform_id (str): Platform ID, such as `show/152334/season/3` or `129`
+
+    Returns:
+        str: Key
+    """
+    if platform == "trakt":
+        parts = platform_id.split("/")
+        if len(parts) == 2:
+            return trakt_key(parts[0], parts[1])
+        if len(parts) == 4 and parts[2] in ["season", "seasons"]:
+            return trakt_key(parts[0], parts[1], parts[3])
+    elif platform == "themoviedb":
+        return f"movie/{platform_id.removeprefix('movie/')}"
+    return platform_id
+
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+"""Upper bounds, in seconds, of the request latency histogram buckets"""
+
+ROUTE_NAMES = {
+    "platform_lookup": "lookup",
+    "trakt_exclusive_route": "trakt",
+    "tmdb_exclusive_route": "tmdb",
+    "redirect_route": "redirect",
+    "bulk_route": "bulk",
+    "search_route": "search",
+    "complete_route": "complete",
+    "export_route": "export",
+}
+"""Route label of endpoints, others are labelled by their endpoint name"""
+
+
+class Metrics:
+    """
+    Request counters, latency histograms, and cache statistics of the process,
+    rendered in the Prometheus text format. Every worker process keeps its own,
+    the same way Prometheus client libraries do without a multiprocess setup.
+    """
+
+    __slots__ = (
+        "requests", "not_found", "latency", "cache_hits", "cache_misses", "cache_evictions",
+        "_lock",
+    )
+
+    def __init__(self) -> None:
+        self.requests: dict[tuple[str, str, int], int] = {}
+        """Requests by route, platform, and status code"""
+        self.not_found: dict[tuple[str, str], int] = {}
+        """404 responses by route and platform"""
+        self.latency: dict[tuple[str, str], list[float]] = {}
+        """Per route and platform: count per bucket, then sum and count"""
+        self.cache_hits: dict[str, int] = {}
+        self.cache_misses: dict[str, int] = {}
+        self.cache_evictions: dict[str, int] = {}
+        self._lock = Lock()
+
+    def observe(self, route: str, platform: str, code: int, seconds: float) -> None:
+        """Record a finished request
+
+        Args:
+            route (str): Route label
+            platform (str): Platform label
+            code (int): Status code
+            seconds (float): Time taken
+        """
+        with self._lock:
+            key = (route, platform)
+            self.requests[(route, platform, code)] = self.requests.get((route, platform, code), 0) + 1
+            if code == 404:
+                self.not_found[key] = self.not_found.get(key, 0) + 1
+            series = self.latency.get(key)
+            if series is None:
+                series = self.latency[key] = [0.0] * (len(LATENCY_BUCKETS) + 2)
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += seconds
+            series[-1] += 1
+
+    def cache(self, name: str, hit: bool) -> None:
+        """Record a cache lookup
+
+        Args:
+            name (str): Cache name
+            hit (bool): Whether the cache answered
+        """
+        counts = self.cache_hits if hit else self.cache_misses
+        with self._lock:
+            counts[name] = counts.get(name, 0) + 1
+
+    def evicted(self, name: str) -> None:
+        """Record a cache eviction
+
+        Args:
+            name (str): Cache name
+        """
+        with self._lock:
+            self.cache_evictions[name] = self.cache_evictions.get(name, 0) + 1
+
+    def render(self, snapshot: Snapshot) -> str:
+        """Render every metric in the Prometheus text format
+
+        Args:
+            snapshot (Snapshot): Snapshot served, for the database gauges
+
+        Returns:
+            str: Metrics
+        """
+        lines: list[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            requests = dict(self.requests)
+            not_found = dict(self.not_found)
+            latency = {key: list(series) for key, series in self.latency.items()}
+            hits = dict(self.cache_hits)
+            misses = dict(self.cache_misses)
+            evictions = dict(self.cache_evictions)
+
+        family("animeapi_requests_total", "counter", "Requests by route, platform, and status code")
+        for (route, platform, code), count in sorted(requests.items()):
+            lines.append(
+                f'animeapi_requests_total{{route="{route}",platform="{platform}",code="{code}"}} {count}')
+        family("animeapi_not_found_total", "counter", "Requests answered with 404")
+        for (route, platform), count in sorted(not_found.items()):
+            lines.append(f'animeapi_not_found_total{{route="{route}",platform="{platform}"}} {count}')
+        family("animeapi_request_duration_seconds", "histogram", "Request latency")
+        for (route, platform), series in sorted(latency.items()):
+            labels = f'route="{route}",platform="{platform}"'
+            cumulative = 0.0
+            for bound, count in zip(LATENCY_BUCKETS, series):
+                cumulative += count
+                lines.append(
+                    f'animeapi_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative:g}')
+            lines.append(
+                f'animeapi_request_duration_seconds_bucket{{{labels},le="+Inf"}} {series[-1]:g}')
+            lines.append(f"animeapi_request_duration_seconds_sum{{{labels}}} {series[-2]}")
+            lines.append(f"animeapi_request_duration_seconds_count{{{labels}}} {series[-1]:g}")
+
+        family("animeapi_cache_hits_total", "counter", "Cache lookups answered by the cache")
+        for name in sorted(set(hits) | set(misses)):
+            lines.append(f'animeapi_cache_hits_total{{cache="{name}"}} {hits.get(name, 0)}')
+        family("animeapi_cache_misses_total", "counter", "Cache lookups the cache could not answer")
+        for name in sorted(set(hits) | set(misses)):
+            lines.append(f'animeapi_cache_misses_total{{cache="{name}"}} {misses.get(name, 0)}')
+        family("animeapi_cache_hit_ratio", "gauge", "Share of cache lookups answered by the cache")
+        for name in sorted(set(hits) | set(misses)):
+            total = hits.get(name, 0) + misses.get(name, 0)
+            lines.append(f'animeapi_cache_hit_ratio{{cache="{name}"}} {hits.get(name, 0) / total:.6f}')
+        family("animeapi_cache_evictions_total", "counter", "Entries evicted from a full cache")
+        for name, count in sorted(evictions.items()):
+            lines.append(f'animeapi_cache_evictions_total{{cache="{name}"}} {count}')
+        family("animeapi_cache_entries", "gauge", "Entries held by the response cache of the build")
+        lines.append(f'animeapi_cache_entries{{cache="responses"}} {len(snapshot.responses.entries)}')
+
+        if snapshot.loaded_at is not None:
+            backend = snapshot.database.backend
+            family("animeapi_database_load_seconds", "gauge", "Time taken to load the database index")
+            lines.append(f'animeapi_database_load_seconds{{backend="{backend}"}} {snapshot.load_seconds}')
+            family("animeapi_database_loaded_timestamp_seconds", "gauge", "When the database index was loaded")
+            lines.append(f'animeapi_database_loaded_timestamp_seconds{{backend="{backend}"}} {snapshot.loaded_at}')
+            family(
+                "animeapi_database_bytes", "gauge",
+                "Memory held by the database index, mapped or file size for mmap and sqlite")
+            lines.append(f'animeapi_database_bytes{{backend="{backend}"}} {snapshot.memory_bytes}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+"""Metrics of the process"""
+
+
+def database_bytes(database: Database) -> int:
+    """Estimate the memory held by a database index
+
+    Args:
+        database (Database): Database index
+
+    Returns:
+        int: Size in bytes, mapped bytes for `mmap` and the file size for `sqlite`
+    """
+    if isinstance(database, MmapDatabase):
+        return len(database.records) + sum(len(mapped) for mapped, _ in database.platforms.values())
+    if isinstance(database, SqliteDatabase):
+        return os.path.getsize(database.path)
+    size = sys.getsizeof(database.blob) + sys.getsizeof(database.offsets)
+    for ids in database.keys.values():
+        size += sys.getsizeof(ids) + sum(sys.getsizeof(key) for key in ids)
+    return size
+
+
+def route_labels() -> tuple[str, str]:
+    """Label the current request by route template and platform, bounded to
+    known values so arbitrary paths can not grow the metrics
+
+    Returns:
+        tuple[str, str]: Route and platform labels
+    """
+    endpoint = request.endpoint
+    if endpoint is None:
+        return "unmatched", "none"
+    route = ROUTE_NAMES.get(endpoint, endpoint)
+    platform = "none"
+    if endpoint == "platform_lookup":
+        platform = str((request.view_args or {}).get("platform", "")).lower()
+        platform = "shoboi" if platform == "syobocal" else platform
+    elif endpoint in ["trakt_exclusive_route", "tmdb_exclusive_route"]:
+        platform = "trakt" if route == "trakt" else "themoviedb"
+    elif endpoint == "redirect_route":
+        platform = resolve_platform(extract_params(request.args)[0]) or "other"
+    elif endpoint == "bulk_route":
+        body = request.get_json(silent=True)
+        platform = str(body.get("platform", "")).lower() if isinstance(body, dict) else ""
+    elif endpoint == "platform_array" and "ids" in request.args:
+        # GET bulk lookups share the endpoint with the array dumps
+        route = ROUTE_NAMES["bulk_route"]
+        platform = str((request.view_args or {}).get("platform", "")).lower()
+    elif endpoint == "platform_array" and request.path.endswith(".tsv"):
+        route = "tsv"
+    if platform not in PLATFORMS and platform != "none":
+        platform = "other"
+    return route, platform
 
 
 @app.before_request
 def before_request():
-    """Before request"""
+    """Before request, pins the snapshot so a reload can not change the data
+    halfway through the request"""
     g.start = time()
+    g.timer = perf_counter()
+    g.snapshot = get_snapshot()
+
+
+# registered before after_request, so it runs after it and sees the final
+# status code, 304 included
+@app.after_request
+def record_metrics(response: Response) -> Response:
+    """
+    After request, records the request in the metrics, and revalidations of
+    cacheable endpoints as hits or misses of the `http` cache
+
+    Args:
+        response (Response): Response
+
+    Returns:
+        Response: Response
+    """
+    route, platform = route_labels()
+    metrics.observe(route, platform, response.status_code, perf_counter() - g.timer)
+    if request.endpoint in CACHEABLE_ENDPOINTS and response.status_code in [200, 304]:
+        metrics.cache("http", response.status_code == 304)
+    return response
+
+
+@app.after_request
+def after_request(response: Response) -> Response:
+    """
+    After request, adds validators and `Cache-Control` to successful data
+    responses, and turns them into `304 Not Modified` when the client's
+    `If-None-Match` or `If-Modified-Since` still matches
+
+    Args:
+        response (Response): Response
+
+    Returns:
+        Response: Response
+    """
+    if response.status_code != 200 or request.endpoint not in CACHEABLE_ENDPOINTS:
+        return response
+    if "ETag" in response.headers:
+        # files streamed from database/ already carry their own validators
+        return response
+    if request.endpoint == "platform_array" and not request.path.endswith(".tsv"):
+        return response
+    build = get_build()
+    if request.endpoint == "schema_json":
+        # the schema ships with the code rather than the dataset
+        response.add_etag()
+    else:
+        response.set_etag(build.etag)
+        response.last_modified = build.updated
+    response.cache_control.public = True
+    response.cache_control.max_age = CACHE_MAX_AGE
+    return response.make_conditional(request)
 
 
 @app.route("/", methods=["GET"])
@@ -69,41 +1682,117 @@ def index():
 @app.route("/status", methods=["GET"])
 def status():
     """Status route"""
-    with open("api/status.json", "r", encoding="utf-8") as file_:
-        return jsonify(json.loads(file_.read()))
+    return jsonify(get_build().status)
 
 
 @app.route("/heartbeat", methods=["GET"])
 @app.route("/ping", methods=["GET"])
 def heartbeat():
-    """Heartbeat route"""
+    """Heartbeat route, a liveness probe that never touches the database"""
     # get request time
     start = time()
-    corrupted_msg: CorruptedResp = {
-        "error": "Internal server error",
-        "code": 500,
-        "message": "myanimelist_object.json is corrupted",
-    }
-    platform = "myanimelist"
-    mid = 1
+    snapshot = get_snapshot()
+    end = time()
+    return jsonify(
+        {
+            "status": "OK",
+            "code": 200,
+            "request_time": f"{round(end - runtime, 3)}s",
+            "response_time": f"{round(end - start, 3)}s",
+            "request_epoch": g.start,
+            "database_load_time": f"{round(snapshot.load_seconds or 0, 3)}s",
+            "database_loaded_epoch": snapshot.loaded_at,
+        }
+    )
+
+
+def file_checksum(file_path: str) -> str:
+    """Hash a file with SHA-256 without reading it into memory at once
+
+    Args:
+        file_path (str): File path
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_:
+        for chunk in iter(lambda: file_.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_checksums(checksums: dict[str, str]) -> dict[str, str]:
+    """Check the files in `database/` against the checksums of their build
+
+    Args:
+        checksums (dict[str, str]): SHA-256 of each file, by file name
+
+    Returns:
+        dict[str, str]: `ok`, `mismatch`, or `missing` for every file
+    """
+    results: dict[str, str] = {}
+    for file_name, expected in checksums.items():
+        try:
+            actual = file_checksum(os.path.join("database", file_name))
+        except FileNotFoundError:
+            # deployments may leave out the artifacts of other backends
+            results[file_name] = "missing"
+            continue
+        results[file_name] = "ok" if actual == expected else "mismatch"
+    return results
+
+
+@app.route("/ready", methods=["GET"])
+def readiness():
+    """
+    Readiness route, loads the database index if needed and reports the build
+    it serves. With `?deep=true`, also checks every database file against the
+    checksums of the build
+
+    Returns:
+        Response: JSON response, `503` when not ready
+    """
+    snapshot = get_snapshot()
     try:
-        test_mal = platform_id_content(platform, mid)
-        if test_mal["myanimelist"] != mid:
-            raise KeyError
-        end = time()
-        return jsonify(
-            {
-                "status": "OK",
-                "code": 200,
-                "request_time": f"{round(end - runtime, 3)}s",
-                "response_time": f"{round(end - start, 3)}s",
-                "request_epoch": g.start,
-            }
-        )
-    except FileNotFoundError:
-        return jsonify(corrupted_msg), 500
-    except KeyError:
-        return jsonify(corrupted_msg), 500
+        build = snapshot.build
+        database = snapshot.database
+    except (OSError, ValueError, KeyError) as err:
+        not_ready: CorruptedResp = {
+            "error": "Service unavailable",
+            "code": 503,
+            "message": f"Database is not loaded: {err}",
+        }
+        return jsonify(not_ready), 503
+    report: dict[str, Any] = {
+        "status": "OK",
+        "code": 200,
+        "backend": database.backend,
+        "build": build.etag,
+        "updated": build.status["updated"]["iso"],
+        "staleness": f"{round(time() - build.status['updated']['timestamp'])}s",
+        "reload_pending": status_stamp() != snapshot.stamp,
+        "database_load_time": f"{round(snapshot.load_seconds or 0, 3)}s",
+        "database_loaded_epoch": snapshot.loaded_at,
+    }
+    if request.args.get("deep", "").lower() in ["1", "true", "yes"]:
+        checksums = verify_checksums(build.status.get("checksums", {}))
+        report["checksums"] = checksums
+        if "mismatch" in checksums.values() and not report["reload_pending"]:
+            report.update({"status": "Corrupted", "code": 503})
+    response = jsonify(report)
+    response.status_code = report["code"]
+    response.cache_control.no_store = True
+    return response
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics_route():
+    """Metrics route, in the Prometheus text format"""
+    return Response(
+        metrics.render(get_snapshot()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
 
 
 @app.route("/favicon.ico", methods=["GET"])
@@ -123,11 +1812,7 @@ def schema_json():
 @app.route("/updated", methods=["GET"])
 def updated():
     """Updated route"""
-    with open("api/status.json", "r", encoding="utf-8") as file_:
-        updated_time = json.loads(file_.read())["updated"]["timestamp"]
-    formatted_time = dtime.fromtimestamp(updated_time, tz=tz.utc).strftime(
-        "%m/%d/%Y %H:%M:%S UTC"
-    )
+    formatted_time = get_build().updated.strftime("%m/%d/%Y %H:%M:%S UTC")
     return Response(f"Updated on {formatted_time}", mimetype="text/plain")
 
 
@@ -164,15 +1849,7 @@ def trakt_exclusive_route(
             }
         ), 400
     try:
-        if not media_type.endswith("s"):
-            media_type_ = f"{media_type}s"
-        else:
-            media_type_ = media_type
-        if season_id is None:
-            return platform_id_content("trakt", f"{media_type_}/{media_id}")
-        return platform_id_content(
-            "trakt", f"{media_type_}/{media_id}/seasons/{season_id}"
-        )
+        return platform_id_response("trakt", trakt_key(media_type, media_id, season_id))
     except KeyError:
         return jsonify(
             {
@@ -212,7 +1889,7 @@ def tmdb_exclusive_route(
             }
         ), 400
     try:
-        return platform_id_content("themoviedb", f"movie/{media_id}")
+        return platform_id_response("themoviedb", f"movie/{media_id}")
     except KeyError:
         return jsonify(
             {
@@ -227,7 +1904,8 @@ def tmdb_exclusive_route(
 @app.route("/<platform>%28%29", methods=["GET"])
 def platform_array(platform: str = "animeapi"):
     """
-    Platform array route, redirects to the raw JSON file on GitHub
+    Platform array route, serves the TSV file, and redirects to the raw JSON
+    file on GitHub unless `LOCAL_EXPORTS` is enabled
 
     Args:
         platform (str, optional): Platform name. Defaults to "animeapi".
@@ -235,11 +1913,24 @@ def platform_array(platform: str = "animeapi"):
     Returns:
         Response: Redirect response
     """
+    ids = request.args.get("ids")
+    if ids is not None:
+        return bulk_lookup(
+            platform,
+            [id_ for id_ in ids.split(",") if id_],
+            request.args.get("target") or request.args.get("to"),
+            request.args.get("fields"),
+        )
+
     route = request.path
     goto = get_goto(route)
 
     if route.endswith(".tsv"):
-        return serve_tsv_response()
+        return serve_database_file("animeapi.tsv", "text/tab-separated-values")
+
+    is_export = goto == "animeapi" or goto.removesuffix("_object") in PLATFORMS
+    if LOCAL_EXPORTS and is_export and os.path.exists(f"database/{goto}.json"):
+        return serve_database_file(f"{goto}.json", "application/json")
 
     return redirect_to_github(goto)
 
@@ -261,13 +1952,39 @@ def get_goto(route: str) -> str:
     return goto
 
 
-def serve_tsv_response() -> Response:
-    with open("database/animeapi.tsv", "r", encoding="utf-8") as file_:
-        response = Response(
-            file_.read(), mimetype="text/tab-separated-values", status=200
-        )
-        response.headers["Content-Disposition"] = 'inline; filename="animeapi.tsv"'
-        return response
+def serve_database_file(file_name: str, mimetype: str) -> Response:
+    """
+    Stream a file from `database/` in chunks, with `Range` support, using its
+    gzip or brotli variant from the generator when `Accept-Encoding` allows
+
+    Args:
+        file_name (str): File name in `database/`
+        mimetype (str): MIME type of the uncompressed file
+
+    Returns:
+        Response: File response
+    """
+    path = f"database/{file_name}"
+    build = get_build()
+    encoding = None
+    for coding, extension in [("br", "br"), ("gzip", "gz")]:
+        if request.accept_encodings[coding] and os.path.exists(f"{path}.{extension}"):
+            encoding, path = coding, f"{path}.{extension}"
+            break
+    response = send_file(
+        os.path.abspath(path),
+        mimetype=mimetype,
+        conditional=True,
+        # each encoding is its own representation, so it needs its own ETag
+        etag=f"{build.etag}-{encoding}" if encoding else build.etag,
+        last_modified=build.updated,
+        max_age=CACHE_MAX_AGE,
+    )
+    response.headers["Content-Disposition"] = f'inline; filename="{file_name}"'
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.content_encoding = encoding
+    return response
 
 
 def redirect_to_github(goto: str) -> wzResponse:
@@ -293,9 +2010,8 @@ def platform_lookup(platform: str, platform_id: Union[int, str]):
     if platform == "syobocal":
         platform = "shoboi"
     try:
-        data = platform_id_content(platform, platform_id)
-        return jsonify(data)
-    except FileNotFoundError:
+        return platform_id_response(platform, platform_id)
+    except PlatformNotFoundError:
         return jsonify(
             {
                 "error": "Not found",
@@ -313,6 +2029,251 @@ def platform_lookup(platform: str, platform_id: Union[int, str]):
         ), 404
 
 
+@app.route("/bulk", methods=["POST"])
+def bulk_route():
+    """
+    Bulk lookup route, takes a JSON body of
+    `{"platform": str, "ids": list[str | int], "target": str | None,
+    "fields": list[str] | str | None}`
+
+    Returns:
+        Response: JSON response
+    """
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return error_response(
+            "Invalid request", 400, "Request body must be a JSON object"
+        )
+    ids: Any = body.get("ids")  # type: ignore
+    if not isinstance(ids, list) or not all(
+        isinstance(id_, (str, int)) and not isinstance(id_, bool)
+        for id_ in ids  # type: ignore
+    ):
+        return error_response(
+            "Invalid request", 400, "`ids` must be a list of strings or integers"
+        )
+    fields: Any = body.get("fields")  # type: ignore
+    if isinstance(fields, list):
+        if not all(isinstance(field, str) for field in fields):  # type: ignore
+            return error_response(
+                "Invalid request", 400, "`fields` must be a list of strings"
+            )
+        fields = ",".join(fields)  # type: ignore
+    return bulk_lookup(
+        str(body.get("platform") or ""),  # type: ignore
+        [str(id_) for id_ in ids],  # type: ignore
+        body.get("target"),  # type: ignore
+        None if fields is None else str(fields),
+    )
+
+
+def bulk_lookup(
+    platform: str,
+    platform_ids: list[str],
+    target: Union[str, None],
+    fields: Union[str, None] = None,
+):
+    """
+    Look up many IDs of a platform at once
+
+    Args:
+        platform (str): Platform name
+        platform_ids (list[str]): Platform IDs
+        target (Union[str, None]): Platform to translate the IDs to, or None to
+            return whole records
+        fields (Union[str, None], optional): Comma-separated record keys to
+            keep in each record, can not be combined with `target`. Defaults
+            to None.
+
+    Returns:
+        Response: JSON response with `found` records (or target IDs) keyed by
+            the requested ID, and the `missing` IDs
+    """
+    platform = platform.lower()
+    if platform == "syobocal":
+        platform = "shoboi"
+    if target is not None:
+        target = str(target).lower()
+        if target == "syobocal":
+            target = "shoboi"
+        if target not in PLATFORMS:
+            return error_response("Invalid target", 400, f"Target {target} not found")
+    tokens = None
+    if fields is not None:
+        if target is not None:
+            return error_response(
+                "Invalid request", 400, "`fields` can not be combined with `target`"
+            )
+        try:
+            tokens = field_tokens(fields)
+        except ValueError as err:
+            return error_response("Invalid request", 400, str(err))
+    if not platform_ids:
+        return error_response("Invalid request", 400, "No IDs to look up")
+    if len(platform_ids) > BULK_MAX_IDS:
+        return error_response(
+            "Too many IDs",
+            413,
+            f"Bulk lookups are limited to {BULK_MAX_IDS} IDs per request, got {len(platform_ids)}",
+        )
+    database = get_database()
+    found: dict[str, Any] = {}
+    missing: list[str] = []
+    for platform_id in platform_ids:
+        key = clean_platform_id(lookup_key(platform, platform_id))
+        try:
+            if tokens is not None:
+                found[platform_id] = project_record(database.get_bytes(platform, key), tokens)
+            elif target is None:
+                found[platform_id] = database.get_bytes(platform, key)
+            else:
+                found[platform_id] = database.get(platform, key).get(target)
+        except PlatformNotFoundError:
+            return error_response("Not found", 404, f"Platform {platform} not found")
+        except KeyError:
+            missing.append(platform_id)
+    if target is not None:
+        return jsonify(
+            {
+                "platform": platform,
+                "target": target,
+                "found": found,
+                "missing": missing,
+            }
+        )
+    # splice the pre-serialized records in rather than decoding and encoding
+    # them again, keeping the sorted, compact layout `jsonify` would produce
+    records = b",".join(
+        json.dumps(platform_id).encode("utf-8") + b":" + found[platform_id].rstrip(b"\n")
+        for platform_id in sorted(found)
+    )
+    body = b"".join([
+        b'{"found":{', records, b'},"missing":',
+        json.dumps(missing, separators=(",", ":")).encode("utf-8"),
+        b',"platform":', json.dumps(platform).encode("utf-8"),
+        b',"target":null}\n',
+    ])
+    return Response(body, mimetype="application/json")
+
+
+@app.route("/search", methods=["GET"])
+def search_route():
+    """
+    Title search route, takes `q` and an optional `limit`
+
+    Returns:
+        Response: JSON response with the records of the best matching titles,
+            most similar first
+    """
+    query = request.args.get("q", "").strip()
+    if not query:
+        return error_response("Invalid request", 400, "Missing `q` query parameter")
+    limit = request.args.get("limit", "10")
+    if not limit.isdigit() or not 1 <= int(limit) <= SEARCH_MAX_RESULTS:
+        return error_response(
+            "Invalid request",
+            400,
+            f"`limit` must be a number from 1 to {SEARCH_MAX_RESULTS}",
+        )
+    snapshot = get_snapshot()
+    matches = snapshot.search.search(query, int(limit))
+    database = snapshot.database
+    # splice the pre-serialized records in, same as bulk lookups
+    results = b",".join(
+        b'{"data":' + database.record(row).rstrip(b"\n")
+        + b',"score":' + json.dumps(score).encode("utf-8") + b"}"
+        for score, row in matches
+    )
+    body = b"".join([
+        b'{"count":', str(len(matches)).encode("utf-8"),
+        b',"query":', json.dumps(query).encode("utf-8"),
+        b',"results":[', results, b"]}\n",
+    ])
+    return Response(body, mimetype="application/json")
+
+
+@app.route("/complete", methods=["GET"])
+def complete_route():
+    """
+    Prefix completion route, takes `prefix`, an optional `platform` to
+    complete its slugs instead of titles, and an optional `limit`
+
+    Returns:
+        Response: JSON response with the records whose title or slug starts
+            with the prefix, in alphabetical order
+    """
+    prefix = request.args.get("prefix", "")
+    if not prefix.strip():
+        return error_response("Invalid request", 400, "Missing `prefix` query parameter")
+    platform = request.args.get("platform", "title").lower()
+    name = platform if platform == "title" else resolve_platform(platform)
+    if name not in COMPLETION_INDEXES:
+        return error_response(
+            "Invalid platform",
+            400,
+            f"Completion is available for {', '.join(COMPLETION_INDEXES)}, got {platform}",
+        )
+    limit = request.args.get("limit", "10")
+    if not limit.isdigit() or not 1 <= int(limit) <= COMPLETE_MAX_RESULTS:
+        return error_response(
+            "Invalid request",
+            400,
+            f"`limit` must be a number from 1 to {COMPLETE_MAX_RESULTS}",
+        )
+    snapshot = get_snapshot()
+    completion = snapshot.completions.get(name)
+    if completion is None:
+        return error_response(
+            "Service unavailable", 503, f"Completion index of {name} is not built"
+        )
+    rows = completion.complete(prefix, int(limit))
+    database = snapshot.database
+    results = b",".join(database.record(row).rstrip(b"\n") for row in rows)
+    body = b"".join([
+        b'{"count":', str(len(rows)).encode("utf-8"),
+        b',"platform":', json.dumps(name).encode("utf-8"),
+        b',"prefix":', json.dumps(prefix).encode("utf-8"),
+        b',"results":[', results, b"]}\n",
+    ])
+    return Response(body, mimetype="application/json")
+
+
+@app.route("/export.ndjson", methods=["GET"])
+def export_route():
+    """
+    Export route, streams every record matching the `has`, `missing`, and
+    record key filters as newline-delimited JSON, optionally projected to
+    `fields`
+
+    Returns:
+        Response: Streamed NDJSON response
+    """
+    try:
+        filters = ExportFilter.from_args(request.args)
+        fields = request.args.get("fields")
+        tokens = None if fields is None else field_tokens(fields)
+    except ValueError as err:
+        return error_response("Invalid request", 400, str(err))
+    database = get_database()
+
+    def generate() -> Iterator[bytes]:
+        chunk = bytearray()
+        for record in database.iter_records():
+            if not filters.matches(record):
+                continue
+            chunk += record if tokens is None else project_record(record, tokens)
+            if len(chunk) >= EXPORT_CHUNK:
+                yield bytes(chunk)
+                chunk.clear()
+        if chunk:
+            yield bytes(chunk)
+
+    response = Response(generate(), mimetype="application/x-ndjson")
+    # keep `make_conditional` from buffering the body to measure it
+    response.implicit_sequence_conversion = False
+    return response
+
+
 # redirect route
 # example: /rd?platform=anilist&platform_id=1&to=kitsu
 @app.route("/rd", methods=["GET"])
@@ -366,10 +2327,28 @@ def redirect_route():
     if platform == "themoviedb" and ("movie" not in platform_id):
         platform_id = f"movie/{platform_id}"
 
-    maps = platform_id_content(platform=platform, platform_id=platform_id)
+    snapshot = get_snapshot()
+    key = clean_platform_id(platform_id)
+    cached = snapshot.responses.get((platform, key, target))
+    if cached is not None:
+        return generate_response(cached, israw)
+    try:
+        redirects = snapshot.redirects
+        if redirects is not None:
+            uri = redirects.uri(snapshot.database.row(platform, key), target)
+            if uri:
+                snapshot.responses.put((platform, key, target), uri)
+                return generate_response(uri, israw)
+        # no precomputed URI, build it from the record for the error message
+        maps = snapshot.database.get(platform, key)
+    except (PlatformNotFoundError, KeyError):
+        return error_response(
+            "Not found", 404, f"{target} not found on {platform} with ID {platform_id}"
+        )
     uri = build_target_uri(target, maps, platform, platform_id)
-    if isinstance(uri, Response):
+    if isinstance(uri, tuple):
         return uri
+    snapshot.responses.put((platform, key, target), uri)
 
     return generate_response(uri, israw)
 
@@ -386,45 +2365,53 @@ def error_response(error, code, message):
     return jsonify({"error": error, "code": code, "message": message}), code
 
 
+PLATFORM_SYNONYMS = {
+    "anidb": ["anidb", "adb", "anidb.net"],
+    "anilist": ["anilist", "al", "anilist.co"],
+    "animeplanet": ["animeplanet", "ap", "anime-planet", "anime-planet.com"],
+    "anisearch": ["anisearch", "as", "anisearch.com"],
+    "annict": ["annict", "anc", "act", "ac", "annict.com"],
+    "imdb": ["imdb", "imdb.com"],
+    "kaize": ["kaize", "kz", "kaize.io"],
+    "kitsu": ["kitsu", "kts", "kt", "kitsu.app", "kitsu.io"],
+    "kurozora": ["kurozora", "kr", "krz", "kurozora.app"],
+    "letterboxd": ["letterboxd", "lb", "letterboxd.com"],
+    "livechart": ["livechart", "lc", "livechart.me"],
+    "myanimelist": ["myanimelist", "mal", "myanimelist.net"],
+    "nautiljon": ["nautiljon", "ntj", "nautiljon.com"],
+    "notify": ["notify", "ntf", "notifymoe", "notify.moe"],
+    "otakotaku": ["otakotaku", "oo", "otakotaku.com"],
+    "shikimori": ["shikimori", "shiki", "shikimori.one"],
+    "shoboi": ["shoboi", "syoboi", "syb", "cal.syoboi.jp"],
+    "silveryasha": ["silveryasha", "dbti", "sy"],
+    "simkl": ["simkl", "smk", "simkl.com"],
+    "themoviedb": ["themoviedb", "tmdb", "tmdb.org"],
+    "trakt": ["trakt", "trk", "trakt.tv"],
+}
+
+PLATFORM_ALIASES = {
+    alias: platform
+    for platform, aliases in PLATFORM_SYNONYMS.items()
+    for alias in aliases
+}
+"""Platform of every synonym, for one dictionary lookup per resolution"""
+
+# fmt: off
+VALID_TARGETS = frozenset([
+    "anidb", "anilist", "animeplanet", "anisearch", "annict", "imdb", "kaize",
+    "kitsu", "kurozora", "livechart", "myanimelist", "nautiljon", "notify",
+    "otakotaku", "shikimori", "shoboi", "silveryasha", "themoviedb", "trakt",
+    "simkl", "letterboxd",
+])
+# fmt: on
+
+
 def resolve_platform(platform):
-    synonyms = {
-        "anidb": ["anidb", "adb", "anidb.net"],
-        "anilist": ["anilist", "al", "anilist.co"],
-        "animeplanet": ["animeplanet", "ap", "anime-planet", "anime-planet.com"],
-        "anisearch": ["anisearch", "as", "anisearch.com"],
-        "annict": ["annict", "anc", "act", "ac", "annict.com"],
-        "imdb": ["imdb", "imdb.com"],
-        "kaize": ["kaize", "kz", "kaize.io"],
-        "kitsu": ["kitsu", "kts", "kt", "kitsu.app", "kitsu.io"],
-        "kurozora": ["kurozora", "kr", "krz", "kurozora.app"],
-        "letterboxd": ["letterboxd", "lb", "letterboxd.com"],
-        "livechart": ["livechart", "lc", "livechart.me"],
-        "myanimelist": ["myanimelist", "mal", "myanimelist.net"],
-        "nautiljon": ["nautiljon", "ntj", "nautiljon.com"],
-        "notify": ["notify", "ntf", "notifymoe", "notify.moe"],
-        "otakotaku": ["otakotaku", "oo", "otakotaku.com"],
-        "shikimori": ["shikimori", "shiki", "shikimori.one"],
-        "shoboi": ["shoboi", "syoboi", "syb", "cal.syoboi.jp"],
-        "silveryasha": ["silveryasha", "dbti", "sy"],
-        "simkl": ["simkl", "smk", "simkl.com"],
-        "themoviedb": ["themoviedb", "tmdb", "tmdb.org"],
-        "trakt": ["trakt", "trk", "trakt.tv"],
-    }
-    for key, value in synonyms.items():
-        if platform in value:
-            return key
-    return None
+    return PLATFORM_ALIASES.get(platform)
 
 
 def is_valid_target(target):
-    # fmt: off
-    valid_targets = [
-        "anidb", "anilist", "animeplanet", "anisearch", "annict", "imdb", "kaize",
-        "kitsu", "kurozora", "livechart", "myanimelist", "nautiljon", "notify",
-        "otakotaku", "shikimori", "shoboi", "silveryasha", "themoviedb", "trakt",
-        "simkl", "letterboxd",
-    ]
-    return target in valid_targets
+    return target in VALID_TARGETS
 
 
 route_path = {
@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: AGPL-3.0-only AND MIT
+
+"""
+Benchmark runner, run from the repository root so relative database paths
+resolve the same way they do for the API and the generator:
+
+    python -m benchmark lookup
+    python -m benchmark encode
+    python -m benchmark redirect
+    python -m benchmark loadtest -n 20000 -c 1000
+    python -m benchmark api --mode socket --server asgi -c 50
+    ANIMEAPI_BACKEND=json python -m benchmark preload -n 20000
+    python -m benchmark combiner -n 500
+    python -m benchmark converter -n 300
+"""
+
+import argparse
+
+
+def main() -> None:
+    """Main function"""
+    parser = argparse.ArgumentParser(prog="python -m benchmark")
+    parser.add_argument("suite", choices=["lookup", "encode", "redirect", "loadtest", "api", "preload", "combiner", "converter"], help="Benchmark to run")
+    parser.add_argument(
+        "-n", "--requests", type=int, default=5000,
+        help="Number of requests to send, defaults to 5000")
+    parser.add_argument(
+        "-c", "--concurrency", type=int,
+        help="Simultaneous connections, defaults to 50 for api in socket mode, "
+        "and 1000 for loadtest, which measures connection handling")
+    parser.add_argument(
+        "--mode", choices=["inprocess", "socket"], default="inprocess",
+        help="How api drives the app, defaults to inprocess")
+    parser.add_argument(
+        "--server", choices=["wsgi", "asgi"], default="wsgi",
+        help="Server api starts in socket mode, defaults to wsgi")
+    parser.add_argument(
+        "-o", "--output",
+        help="JSON file api saves results to, defaults to benchmark/results/{commit}-{mode}.json")
+    args = parser.parse_args()
+    # left to each suite's own default when not given
+    concurrency = {} if args.concurrency is None else {"concurrency": args.concurrency}
+
+    match args.suite:
+        case "lookup":
+            from benchmark.lookup import run
+            run(args.requests)
+        case "encode":
+            from benchmark.encode import run
+            run(args.requests)
+        case "redirect":
+            from benchmark.redirect import run
+            run(args.requests)
+        case "api":
+            from benchmark.api import run
+            run(args.requests, args.mode, args.server, output=args.output, **concurrency)
+        case "preload":
+            from benchmark.preload import run
+            run(args.requests)
+        case "combiner":
+            from benchmark.combiner import run
+            run(args.requests)
+        case "converter":
+            from benchmark.converter import run
+            run(args.requests)
+        case "loadtest":
+            from benchmark.loadtest import run
+            run(args.requests, **concurrency)
+        case _:
+            parser.error(f"Unknown suite {args.suite}")
+
+
+if __name__ == "__main__":
+    main()
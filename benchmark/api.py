@@ -0,0 +1,307 @@
+# SPDX-License-Identifier: AGPL-3.0-only AND MIT
+
+"""
+Measure throughput, latency percentiles, and memory of the API on a realistic
+request mix, either in-process through Flask's test client or over sockets
+against a real server, and save the results as JSON to compare commits
+"""
+
+import asyncio
+import json
+import os
+import resource
+import subprocess
+from datetime import datetime, timezone
+from random import Random
+from statistics import quantiles
+from time import perf_counter
+from typing import Any, Union
+
+from benchmark.loadtest import free_port, read_response, start_server
+
+MIX: dict[str, float] = {
+    "myanimelist": 0.35,
+    "trakt": 0.15,
+    "themoviedb": 0.10,
+    "redirect": 0.25,
+    "tsv": 0.02,
+    "not_found": 0.13,
+}
+"""Share of each kind of request in the mix"""
+
+REDIRECT_TARGETS = [
+    "anidb", "anilist", "kitsu", "myanimelist", "shikimori", "trakt", "simkl", "kurozora",
+]
+"""Targets redirects are drawn from"""
+
+
+def platform_ids(platforms: list[str]) -> dict[str, list[str]]:
+    """
+    Collect the lookup keys of platforms from database/animeapi.json, keyed the
+    same way the generator keys the object files
+
+    :param platforms: platform names
+    :type platforms: list[str]
+    :return: keys of each platform
+    :rtype: dict[str, list[str]]
+    """
+    from api.index import platform_keys  # pylint: disable=import-outside-toplevel
+
+    with open("database/animeapi.json", "r", encoding="utf-8") as file_:
+        data = json.load(file_)
+    return {
+        platform: sorted({key for item in data for key in platform_keys(platform, item)})
+        for platform in platforms
+    }
+
+
+def request_mix(count: int, seed: int = 0) -> list[tuple[str, str]]:
+    """
+    Draw a request mix from the IDs in database/animeapi.json
+
+    :param count: number of requests
+    :type count: int
+    :param seed: random seed, so runs are comparable, defaults to 0
+    :type seed: int, optional
+    :return: kind and path of every request
+    :rtype: list[tuple[str, str]]
+    """
+    rng = Random(seed)
+    ids = platform_ids(["myanimelist", "trakt", "themoviedb", "anilist"])
+    myanimelist = ids["myanimelist"]
+    seasons = [key for key in ids["trakt"] if "/seasons/" in key]
+    movies = ids["themoviedb"]
+    anilist = ids["anilist"]
+    kinds = rng.choices(list(MIX), weights=list(MIX.values()), k=count)
+    mix: list[tuple[str, str]] = []
+    for kind in kinds:
+        match kind:
+            case "myanimelist":
+                path = f"/myanimelist/{rng.choice(myanimelist)}"
+            case "trakt":
+                path = f"/trakt/{rng.choice(seasons)}"
+            case "themoviedb":
+                path = f"/themoviedb/{rng.choice(movies)}"
+            case "redirect":
+                path = f"/rd?from=anilist&id={rng.choice(anilist)}&to={rng.choice(REDIRECT_TARGETS)}"
+            case "tsv":
+                path = "/animeapi.tsv"
+            case _:
+                path = rng.choice([
+                    f"/myanimelist/{rng.randint(10**8, 10**9)}",
+                    f"/anilist/{rng.randint(10**8, 10**9)}",
+                    f"/unknown/{rng.randint(1, 1000)}",
+                ])
+        mix.append((kind, path))
+    return mix
+
+
+def rss_bytes(pid: int) -> Union[int, None]:
+    """
+    Resident set size of a process and all of its children, from /proc
+
+    :param pid: process ID
+    :type pid: int
+    :return: size in bytes, or None where /proc is not available
+    :rtype: Union[int, None]
+    """
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as file_:
+            rss = next(
+                int(line.split()[1]) * 1024 for line in file_ if line.startswith("VmRSS:"))
+        with open(f"/proc/{pid}/task/{pid}/children", "r", encoding="utf-8") as file_:
+            children = [int(child) for child in file_.read().split()]
+    except (OSError, StopIteration):
+        return None
+    return rss + sum(rss_bytes(child) or 0 for child in children)
+
+
+def summarize(latencies: dict[str, list[float]], elapsed: float) -> dict[str, Any]:
+    """
+    Summarize latencies overall and per kind of request
+
+    :param latencies: latencies in seconds, by kind of request
+    :type latencies: dict[str, list[float]]
+    :param elapsed: wall time of the run, in seconds
+    :type elapsed: float
+    :return: throughput and percentiles, in milliseconds
+    :rtype: dict[str, Any]
+    """
+
+    def stats(values: list[float]) -> dict[str, float]:
+        cuts = quantiles(values, n=100) if len(values) > 1 else values * 99
+        return {
+            "requests": len(values),
+            "p50_ms": round(cuts[49] * 1000, 3),
+            "p95_ms": round(cuts[94] * 1000, 3),
+            "p99_ms": round(cuts[98] * 1000, 3),
+        }
+
+    everything = [value for values in latencies.values() for value in values]
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(everything) / elapsed, 1),
+        **stats(everything),
+        "routes": {kind: stats(values) for kind, values in sorted(latencies.items()) if values},
+    }
+
+
+def run_inprocess(mix: list[tuple[str, str]]) -> dict[str, Any]:
+    """
+    Send the mix through Flask's test client, one request at a time
+
+    :param mix: kind and path of every request
+    :type mix: list[tuple[str, str]]
+    :return: summary, with the peak RSS of this process
+    :rtype: dict[str, Any]
+    """
+    from api.index import app  # pylint: disable=import-outside-toplevel
+
+    client = app.test_client()
+    # warm up, so one-off loading is not part of the measurement
+    for _, path in mix[:20]:
+        client.get(path)
+    latencies: dict[str, list[float]] = {kind: [] for kind in MIX}
+    start = perf_counter()
+    for kind, path in mix:
+        began = perf_counter()
+        response = client.get(path)
+        response.get_data()
+        response.close()
+        latencies[kind].append(perf_counter() - began)
+    summary = summarize(latencies, perf_counter() - start)
+    summary["rss_bytes"] = rss_bytes(os.getpid())
+    summary["max_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return summary
+
+
+async def socket_load(
+    port: int, mix: list[tuple[str, str]], concurrency: int,
+) -> tuple[float, dict[str, list[float]], int]:
+    """
+    Spread the mix over `concurrency` keep-alive connections opened at once
+
+    :param port: server port
+    :type port: int
+    :param mix: kind and path of every request
+    :type mix: list[tuple[str, str]]
+    :param concurrency: number of simultaneous connections
+    :type concurrency: int
+    :return: elapsed seconds, latencies by kind, and error count
+    :rtype: tuple[float, dict[str, list[float]], int]
+    """
+    latencies: dict[str, list[float]] = {kind: [] for kind in MIX}
+
+    async def connection(requests: list[tuple[str, str]]) -> int:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1 << 20)
+        try:
+            for kind, path in requests:
+                began = perf_counter()
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n".encode())
+                await read_response(reader)
+                latencies[kind].append(perf_counter() - began)
+        except (OSError, asyncio.IncompleteReadError):
+            return 1
+        finally:
+            writer.close()
+        return 0
+
+    start = perf_counter()
+    errors = await asyncio.gather(*(
+        connection(mix[index::concurrency]) for index in range(concurrency)))
+    return perf_counter() - start, latencies, sum(errors)
+
+
+def run_socket(mix: list[tuple[str, str]], server: str, concurrency: int) -> dict[str, Any]:
+    """
+    Send the mix over sockets to a server started for the run
+
+    :param mix: kind and path of every request
+    :type mix: list[tuple[str, str]]
+    :param server: "wsgi" or "asgi"
+    :type server: str
+    :param concurrency: number of simultaneous connections
+    :type concurrency: int
+    :return: summary, with the RSS of the server after the run
+    :rtype: dict[str, Any]
+    """
+    port = free_port()
+    process = start_server(server, port, os.cpu_count() or 1)
+    try:
+        asyncio.run(socket_load(port, mix[:concurrency], concurrency))
+        elapsed, latencies, errors = asyncio.run(socket_load(port, mix, concurrency))
+        summary = summarize(latencies, elapsed)
+        summary["errors"] = errors
+        summary["rss_bytes"] = rss_bytes(process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+    return summary
+
+
+def git_commit() -> str:
+    """
+    Get the short hash of the checked out commit
+
+    :return: hash, or "unknown" outside of a git checkout
+    :rtype: str
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, check=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(
+    count: int,
+    mode: str = "inprocess",
+    server: str = "wsgi",
+    concurrency: int = 50,
+    output: Union[str, None] = None,
+) -> None:
+    """
+    Benchmark the API on the request mix, print the results, and save them
+
+    :param count: number of requests
+    :type count: int
+    :param mode: "inprocess" or "socket", defaults to "inprocess"
+    :type mode: str, optional
+    :param server: server for socket mode, "wsgi" or "asgi", defaults to "wsgi"
+    :type server: str, optional
+    :param concurrency: simultaneous connections in socket mode, defaults to 50
+    :type concurrency: int, optional
+    :param output: JSON file to save to, defaults to
+        benchmark/results/{commit}-{mode}.json
+    :type output: Union[str, None], optional
+    """
+    mix = request_mix(count)
+    commit = git_commit()
+    if mode == "socket":
+        summary = run_socket(mix, server, concurrency)
+        label = f"socket-{server}"
+    else:
+        summary = run_inprocess(mix)
+        label = "inprocess"
+    result = {
+        "commit": commit,
+        "mode": label,
+        "date": datetime.now(tz=timezone.utc).isoformat(),
+        "backend": os.getenv("ANIMEAPI_BACKEND", "auto"),
+        "concurrency": concurrency if mode == "socket" else 1,
+        **summary,
+    }
+    print(f"{label} @ {commit}: {summary['throughput_rps']} requests/s, "
+          f"p50 {summary['p50_ms']}ms, p95 {summary['p95_ms']}ms, p99 {summary['p99_ms']}ms")
+    for kind, stats in result["routes"].items():
+        print(f"  {kind:<12} {stats['requests']:>6} requests, p50 {stats['p50_ms']}ms, "
+              f"p95 {stats['p95_ms']}ms, p99 {stats['p99_ms']}ms")
+    if summary.get("rss_bytes"):
+        print(f"  RSS {summary['rss_bytes'] / 2**20:.1f} MiB")
+    output = output or f"benchmark/results/{commit}-{label}.json"
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file_:
+        json.dump(result, file_, indent=2)
+    print(f"Saved to {output}")
@@ -0,0 +1,244 @@
+# SPDX-License-Identifier: AGPL-3.0-only AND MIT
+
+"""
+Measure the generator's combiner stages against the scan-per-item joins they
+replaced, on the raw files shipped in database/raw and AOD-shaped items from
+database/raw/aod.json, or database/animeapi.json when AOD was not downloaded
+"""
+
+import copy
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from time import perf_counter
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "generator"))
+
+AOD_FIELDS = [
+    "title", "anidb", "anilist", "animeplanet", "anisearch", "kitsu", "livechart",
+    "myanimelist", "notify", "shikimori",
+]
+"""Keys of the items `simplify_aod_data` produces"""
+
+Stage = Callable[[Any, list[dict[str, Any]]], list[dict[str, Any]]]
+
+
+def aod_items() -> list[dict[str, Any]]:
+    """
+    Load AOD-shaped items, simplified the same way the generator does
+
+    :return: AOD items
+    :rtype: list[dict[str, Any]]
+    """
+    if os.path.exists("database/raw/aod.json"):
+        from fetcher import simplify_aod_data  # pylint: disable=import-outside-toplevel,import-error
+
+        with open("database/raw/aod.json", "r", encoding="utf-8") as file_:
+            with redirect_stdout(StringIO()):
+                return simplify_aod_data(json.load(file_))
+    with open("database/animeapi.json", "r", encoding="utf-8") as file_:
+        return [{field: item[field] for field in AOD_FIELDS} for item in json.load(file_)]
+
+
+def legacy_combine_arm(
+    arm: list[dict[str, Any]], aod: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    `combine_arm` as it was, scanning ARM for every AOD item
+
+    :param arm: ARM data
+    :type arm: list[dict[str, Any]]
+    :param aod: AOD data
+    :type aod: list[dict[str, Any]]
+    :return: AOD data
+    :rtype: list[dict[str, Any]]
+    """
+    for item in aod:
+        myanimelist = item['myanimelist']
+        anilist = item['anilist']
+        if myanimelist is None and anilist is None:
+            item.update({'shoboi': None, 'annict': None})
+            continue
+        for arm_item in arm:
+            mal_id = arm_item.get('mal_id', None)
+            anilist_id = arm_item.get('anilist_id', None)
+            syoboi = arm_item.get('syobocal_tid', None)
+            annict = arm_item.get('annict_id', None)
+            if myanimelist is not None and mal_id == myanimelist:
+                item.update({
+                    'shoboi': syoboi,
+                    'annict': annict,
+                    'anilist': anilist if anilist is not None else anilist_id,
+                })
+                break
+            elif anilist is not None and anilist_id == anilist:
+                item.update({
+                    'shoboi': syoboi,
+                    'annict': annict,
+                    'myanimelist': myanimelist if myanimelist is not None else mal_id,
+                    'shikimori': myanimelist if myanimelist is not None else mal_id,
+                })
+                break
+    return aod
+
+
+def legacy_combine_anitrakt(
+    anitrakt: list[dict[str, Any]], aod: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    `combine_anitrakt` as it was, scanning AniTrakt for every AOD item and
+    attaching the first entry of the MAL ID
+
+    :param anitrakt: AniTrakt data
+    :type anitrakt: list[dict[str, Any]]
+    :param aod: AOD data
+    :type aod: list[dict[str, Any]]
+    :return: AOD data
+    :rtype: list[dict[str, Any]]
+    """
+    for item in aod:
+        myanimelist = item['myanimelist']
+        item.update({'trakt': None, 'trakt_type': None, 'trakt_season': None})
+        if myanimelist is None:
+            continue
+        for anitrakt_item in anitrakt:
+            if anitrakt_item.get('mal_id', None) == myanimelist:
+                item.update({
+                    'trakt': anitrakt_item.get('trakt_id', None),
+                    'trakt_type': anitrakt_item.get('type', None),
+                    'trakt_season': anitrakt_item.get('season', None),
+                })
+                break
+    return aod
+
+
+def legacy_combine_fribb(
+    fribb: list[dict[str, Any]], aod: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    `combine_fribb` as it was, scanning Fribb's Animelists for every AOD item
+    and parsing TMDB IDs inside the scan
+
+    :param fribb: Fribb's Animelists data
+    :type fribb: list[dict[str, Any]]
+    :param aod: AOD data
+    :type aod: list[dict[str, Any]]
+    :return: AOD data
+    :rtype: list[dict[str, Any]]
+    """
+    for item in aod:
+        anidb = item['anidb']
+        item.update({'imdb': None, 'themoviedb': None})
+        if anidb is None:
+            continue
+        for fbi in fribb:
+            tmdb: str | int | None = fbi.get('themoviedb_id', None)
+            if fbi.get('anidb_id', None) == anidb:
+                if isinstance(tmdb, str):
+                    tmdb = int(tmdb.split(",")[0])
+                item.update({'imdb': fbi.get('imdb_id', None), 'themoviedb': tmdb})
+                break
+    return aod
+
+
+def present(item: dict[str, Any]) -> dict[str, Any]:
+    """
+    Keep the keys of an item that are set, as the generator fills every
+    missing key with None before saving
+
+    :param item: AOD item
+    :type item: dict[str, Any]
+    :return: set keys
+    :rtype: dict[str, Any]
+    """
+    return {key: value for key, value in item.items() if value is not None}
+
+
+def legacy_combine_all(
+    sources: tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]],
+    aod: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """
+    The three legacy stages, run one after another like the generator did
+
+    :param sources: ARM, AniTrakt, and Fribb's Animelists data
+    :type sources: tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]
+    :param aod: AOD data
+    :type aod: list[dict[str, Any]]
+    :return: AOD data
+    :rtype: list[dict[str, Any]]
+    """
+    arm, anitrakt, fribb = sources
+    aod = legacy_combine_arm(arm, aod)
+    aod = legacy_combine_anitrakt(anitrakt, aod)
+    return legacy_combine_fribb(fribb, aod)
+
+
+def measure(
+    name: str, source: Any, aod: list[dict[str, Any]],
+    legacy: Stage, current: Stage, count: int,
+) -> None:
+    """
+    Time a stage both ways and check they combine identically. The legacy
+    join only runs on the first `count` items, it would take minutes on all
+
+    :param name: stage name
+    :type name: str
+    :param source: data joined into AOD
+    :type source: Any
+    :param aod: AOD items, left untouched
+    :type aod: list[dict[str, Any]]
+    :param legacy: scan-per-item join
+    :type legacy: Stage
+    :param current: generator's join
+    :type current: Stage
+    :param count: number of AOD items the legacy join runs on
+    :type count: int
+    """
+    sample = copy.deepcopy(aod[:count])
+    start = perf_counter()
+    expected = legacy(source, sample)
+    legacy_seconds = perf_counter() - start
+
+    items = copy.deepcopy(aod)
+    with redirect_stdout(StringIO()):
+        start = perf_counter()
+        combined = current(source, items)
+        current_seconds = perf_counter() - start
+
+    mismatches = sum(1 for old, new in zip(expected, combined) if present(old) != present(new))
+    per_item = legacy_seconds / len(sample)
+    size = sum(len(part) for part in source) if isinstance(source, tuple) else len(source)
+    print(f"{name}: {size} source entries, {len(aod)} AOD items")
+    print(f"  legacy:   {per_item * 1e3:.3f} ms/item over {len(sample)} items, "
+          f"~{per_item * len(aod):.1f}s for all")
+    print(f"  indexed:  {current_seconds * 1e3:.1f} ms for all")
+    print(f"  sampled items combined differently: {mismatches}")
+
+
+def run(count: int) -> None:
+    """
+    Benchmark every combiner stage
+
+    :param count: number of AOD items the legacy joins run on
+    :type count: int
+    """
+    # pylint: disable=import-outside-toplevel,import-error
+    from combiner import combine_all, combine_anitrakt, combine_arm, combine_fribb
+
+    aod = aod_items()
+    with open("database/raw/arm.json", "r", encoding="utf-8") as file_:
+        arm = json.load(file_)
+    measure("combine_arm", arm, aod, legacy_combine_arm, combine_arm, count)
+    with open("database/raw/anitrakt.json", "r", encoding="utf-8") as file_:
+        anitrakt = json.load(file_)
+    measure("combine_anitrakt", anitrakt, aod, legacy_combine_anitrakt, combine_anitrakt, count)
+    with open("database/raw/fribb_animelists.json", "r", encoding="utf-8") as file_:
+        fribb = json.load(file_)
+    measure("combine_fribb", fribb, aod, legacy_combine_fribb, combine_fribb, count)
+    measure(
+        "combine_all", (arm, anitrakt, fribb), aod, legacy_combine_all,
+        lambda sources, items: combine_all(*sources, items), count)
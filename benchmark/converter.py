@@ -0,0 +1,79 @@
+# SPDX-License-Identifier: AGPL-3.0-only AND MIT
+
+"""
+Measure the fuzzy title matching of the generator's `link_*_to_mal` stages
+against the scan over every AOD title it replaced, matching the Nautiljon
+titles of database/raw/nautiljon.json that have no exact AOD title at each
+threshold the stages use
+"""
+
+import json
+from time import perf_counter
+
+from benchmark.combiner import aod_items
+
+THRESHOLDS = [85, 90, 95]
+"""Thresholds of Kaize, Nautiljon and Otak Otaku, and SilverYasha"""
+
+
+def legacy_match(title: str, titles: list[str], threshold: int) -> int | None:
+    """
+    Fuzzy matching as it was, scoring every title until one passes
+
+    :param title: title to match
+    :type title: str
+    :param titles: AOD titles
+    :type titles: list[str]
+    :param threshold: least ratio
+    :type threshold: int
+    :return: row of the first title passing, or None
+    :rtype: int | None
+    """
+    # pylint: disable=import-outside-toplevel,import-error
+    from fuzzywuzzy import fuzz  # type: ignore
+
+    for row, aod_title in enumerate(titles):
+        if fuzz.ratio(title, aod_title) >= threshold:  # type: ignore
+            return row
+    return None
+
+
+def run(count: int) -> None:
+    """
+    Benchmark fuzzy title matching at every threshold
+
+    :param count: number of Nautiljon titles the legacy scan matches
+    :type count: int
+    """
+    # pylint: disable=import-outside-toplevel,import-error
+    from matcher import TitleMatcher
+
+    titles = [item["title"] for item in aod_items()]
+    exact = set(titles)
+    with open("database/raw/nautiljon.json", "r", encoding="utf-8") as file_:
+        unlinked = [item["title"] for item in json.load(file_) if item["title"] not in exact]
+    sample = unlinked[:count]
+    print(f"{len(unlinked)} unlinked Nautiljon titles, {len(titles)} AOD titles")
+    for threshold in THRESHOLDS:
+        start = perf_counter()
+        expected = [legacy_match(title, titles, threshold) for title in sample]
+        legacy_seconds = perf_counter() - start
+
+        start = perf_counter()
+        matcher = TitleMatcher(titles, threshold)
+        index_seconds = perf_counter() - start
+        start = perf_counter()
+        matched = [matcher.match(title) for title in unlinked]
+        match_seconds = perf_counter() - start
+
+        per_title = legacy_seconds / len(sample)
+        mismatches = sum(1 for old, new in zip(expected, matched) if old != new)
+        print(f"ratio >= {threshold}:")
+        print(f"  legacy:   {per_title * 1e3:.2f} ms/title over {len(sample)} titles, "
+              f"~{per_title * len(unlinked):.1f}s for all, "
+              f"{sum(1 for row in expected if row is not None)} matched")
+        print(f"  blocked:  {index_seconds * 1e3:.0f} ms indexing, "
+              f"{match_seconds * 1e3:.0f} ms for all, "
+              f"{matcher.scored / len(unlinked):.1f} ratios/title, "
+              f"{sum(1 for row in matched if row is not None)} matched")
+        print(f"  sampled titles matched differently: {mismatches}")
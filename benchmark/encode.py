@@ -0,0 +1,65 @@
+# SPDX-License-Identifier: AGPL-3.0-only AND MIT
+
+"""
+Measure the encode time pre-rendered record bytes save per lookup response,
+and what projecting them to a few `fields` costs and saves
+"""
+
+import json
+from time import perf_counter
+
+from flask import Response, jsonify
+
+from api.index import app, field_tokens, get_database, project_record
+from benchmark.lookup import sample_paths
+
+
+FIELDS = "anilist,myanimelist"
+"""Projection measured, typical of bulk translation traffic"""
+
+
+def run(count: int) -> None:
+    """
+    Build `count` lookup responses both ways and print the time per response
+
+    :param count: number of responses to build
+    :type count: int
+    """
+    database = get_database()
+    lookups = [path[1:].split("/", 1) for path in sample_paths(count)]
+    records = [database.get(platform, key) for platform, key in lookups]
+    rendered = [database.get_bytes(platform, key) for platform, key in lookups]
+
+    with app.app_context():
+        start = perf_counter()
+        for record in records:
+            jsonify(record).get_data()
+        encoded = perf_counter() - start
+
+        start = perf_counter()
+        for body in rendered:
+            Response(body, mimetype="application/json").get_data()
+        prerendered = perf_counter() - start
+
+        wanted = FIELDS.split(",")
+        start = perf_counter()
+        for body in rendered:
+            record = json.loads(body)
+            jsonify({field: record[field] for field in wanted}).get_data()
+        comprehension = perf_counter() - start
+
+        tokens = field_tokens(FIELDS)
+        start = perf_counter()
+        for body in rendered:
+            Response(project_record(body, tokens), mimetype="application/json").get_data()
+        projected = perf_counter() - start
+
+    full_size = sum(len(body) for body in rendered)
+    projected_size = sum(len(project_record(body, tokens)) for body in rendered)
+    print(f"jsonify:      {encoded / count * 1e6:.2f} µs/response")
+    print(f"pre-rendered: {prerendered / count * 1e6:.2f} µs/response")
+    print(f"saved:        {(encoded - prerendered) / count * 1e6:.2f} µs/response")
+    print(f"fields={FIELDS}")
+    print(f"  decode + comprehension:  {comprehension / count * 1e6:.2f} µs/response")
+    print(f"  projected bytes:         {projected / count * 1e6:.2f} µs/response")
+    print(f"  body size:               {full_size / count:.0f} -> {projected_size / count:.0f} bytes/response")
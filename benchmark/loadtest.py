@@ -0,0 +1,181 @@
+# SPDX-License-Identifier: AGPL-3.0-only AND MIT
+
+"""
+Load test the WSGI (gunicorn) and ASGI (uvicorn) deployments over real
+sockets, holding many keep-alive connections open at once. Neither server is
+a dependency of the API, install them first:
+
+    pip install gunicorn uvicorn
+"""
+
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+from statistics import quantiles
+from time import perf_counter, sleep
+
+from benchmark.lookup import sample_paths
+
+SERVERS: dict[str, list[str]] = {
+    "wsgi": [
+        "gunicorn", "api.index:app", "--worker-class", "gthread",
+        "--threads", "32", "--worker-connections", "4096", "--backlog", "4096",
+        "--log-level", "warning"],
+    "asgi": [
+        "uvicorn", "api.asgi:app", "--backlog", "4096", "--log-level", "warning"],
+}
+"""Server command lines, without the address and worker count"""
+
+
+def free_port() -> int:
+    """
+    Ask the OS for an unused TCP port
+
+    :return: port number
+    :rtype: int
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind: str, port: int, workers: int) -> subprocess.Popen:
+    """
+    Start a server and wait until it accepts connections
+
+    :param kind: "wsgi" or "asgi"
+    :type kind: str
+    :param port: port to bind on 127.0.0.1
+    :type port: int
+    :param workers: number of worker processes
+    :type workers: int
+    :return: server process
+    :rtype: subprocess.Popen
+    """
+    command = SERVERS[kind]
+    if shutil.which(command[0]) is None:
+        raise SystemExit(f"{command[0]} is not installed, run `pip install {command[0]}`")
+    match kind:
+        case "wsgi":
+            address = ["--bind", f"127.0.0.1:{port}", "--workers", str(workers)]
+        case _:
+            address = ["--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)]
+    process = subprocess.Popen(command + address)  # pylint: disable=consider-using-with
+    for _ in range(100):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return process
+        except OSError:
+            sleep(0.1)
+    process.kill()
+    raise SystemExit(f"{command[0]} did not start listening on port {port}")
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """
+    Read one HTTP/1.1 response, sized by Content-Length or chunked
+
+    :param reader: connection reader
+    :type reader: asyncio.StreamReader
+    :return: status code
+    :rtype: int
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {
+        name.strip().lower(): value.strip()
+        for name, _, value in (line.partition(":") for line in lines[1:] if line)
+    }
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    return status
+
+
+async def connection(port: int, paths: list[str], latencies: list[float]) -> int:
+    """
+    Send requests one after another over a single keep-alive connection
+
+    :param port: server port
+    :type port: int
+    :param paths: request paths for this connection
+    :type paths: list[str]
+    :param latencies: list the latency of every request is appended to
+    :type latencies: list[float]
+    :return: number of failed or non-200/404 responses
+    :rtype: int
+    """
+    errors = 0
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for path in paths:
+            start = perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n".encode())
+            status = await read_response(reader)
+            latencies.append(perf_counter() - start)
+            if status not in (200, 404):
+                errors += 1
+    except (OSError, asyncio.IncompleteReadError):
+        errors += 1
+    finally:
+        writer.close()
+    return errors
+
+
+async def load(port: int, paths: list[str], concurrency: int) -> tuple[float, list[float], int]:
+    """
+    Spread paths over `concurrency` connections opened at once
+
+    :param port: server port
+    :type port: int
+    :param paths: request paths
+    :type paths: list[str]
+    :param concurrency: number of simultaneous connections
+    :type concurrency: int
+    :return: elapsed seconds, latencies, and error count
+    :rtype: tuple[float, list[float], int]
+    """
+    latencies: list[float] = []
+    start = perf_counter()
+    errors = await asyncio.gather(*(
+        connection(port, paths[index::concurrency], latencies)
+        for index in range(concurrency)))
+    return perf_counter() - start, latencies, sum(errors)
+
+
+def run(count: int, concurrency: int = 1000) -> None:
+    """
+    Load test both deployments with the same request mix and print
+    throughput and latency percentiles
+
+    :param count: number of requests per server
+    :type count: int
+    :param concurrency: number of simultaneous connections, defaults to 1000
+    :type concurrency: int, optional
+    """
+    paths = sample_paths(count)
+    workers = os.cpu_count() or 1
+    for kind in SERVERS:
+        port = free_port()
+        process = start_server(kind, port, workers)
+        try:
+            asyncio.run(load(port, paths[:concurrency], concurrency))
+            elapsed, latencies, errors = asyncio.run(load(port, paths, concurrency))
+        finally:
+            process.terminate()
+            process.wait()
+        cuts = quantiles(latencies, n=100)
+        print(
+            f"{kind}: {len(latencies)} requests over {concurrency} connections "
+            f"in {elapsed:.2f}s, {len(latencies) / elapsed:.0f} requests/s, "
+            f"p50 {cuts[49] * 1000:.1f}ms, p99 {cuts[98] * 1000:.1f}ms, "
+            f"{errors} errors", file=sys.stdout)
@@ -0,0 +1,58 @@
+# SPDX-License-Identifier: AGPL-3.0-only AND MIT
+
+"""Measure lookup throughput of the API through Flask's test client"""
+
+import json
+import os
+from itertools import cycle, islice
+from random import Random
+from time import perf_counter
+
+from api.index import app
+
+
+def sample_paths(count: int, seed: int = 0) -> list[str]:
+    """
+    Draw lookup paths from the object files available in database/
+
+    :param count: number of paths to draw
+    :type count: int
+    :param seed: random seed, so runs are comparable, defaults to 0
+    :type seed: int, optional
+    :return: request paths
+    :rtype: list[str]
+    """
+    rng = Random(seed)
+    paths: list[str] = []
+    for file_name in sorted(os.listdir("database")):
+        if not file_name.endswith("_object.json"):
+            continue
+        platform = file_name.removesuffix("_object.json")
+        with open(f"database/{file_name}", "r", encoding="utf-8") as file_:
+            keys = list(json.load(file_).keys())
+        picks = rng.sample(keys, min(len(keys), max(1, count // 4)))
+        paths.extend(f"/{platform}/{key}" for key in picks)
+    rng.shuffle(paths)
+    return list(islice(cycle(paths), count))
+
+
+def run(count: int) -> None:
+    """
+    Send `count` lookups and print the achieved throughput
+
+    :param count: number of requests
+    :type count: int
+    """
+    paths = sample_paths(count)
+    client = app.test_client()
+    # warm up, so one-off loading is not part of the measurement
+    for path in paths[:10]:
+        client.get(path)
+    misses = 0
+    start = perf_counter()
+    for path in paths:
+        if client.get(path).status_code != 200:
+            misses += 1
+    elapsed = perf_counter() - start
+    print(f"{count} lookups in {elapsed:.3f}s")
+    print(f"{count / elapsed:.1f} requests/s, {misses} non-200 responses")
@@ -0,0 +1,94 @@
+# SPDX-License-Identifier: AGPL-3.0-only AND MIT
+
+"""
+Measure the unique set size (USS) of pre-forked gunicorn workers after warm-up,
+with the database preloaded in the master and without, to see how much memory
+each extra worker costs
+"""
+
+import asyncio
+import os
+from typing import Union
+
+from benchmark.loadtest import free_port, load, start_server
+from benchmark.lookup import sample_paths
+
+
+def children(pid: int) -> list[int]:
+    """
+    List the direct children of a process, from /proc
+
+    :param pid: process ID
+    :type pid: int
+    :return: child process IDs
+    :rtype: list[int]
+    """
+    with open(f"/proc/{pid}/task/{pid}/children", "r", encoding="utf-8") as file_:
+        return [int(child) for child in file_.read().split()]
+
+
+def memory(pid: int) -> dict[str, int]:
+    """
+    Read the RSS, PSS, and USS of a process, from /proc
+
+    :param pid: process ID
+    :type pid: int
+    :return: sizes in bytes, by name
+    :rtype: dict[str, int]
+    """
+    fields: dict[str, int] = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r", encoding="utf-8") as file_:
+        for line in file_:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0]) * 1024
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def measure(count: int, workers: int, preload: bool) -> list[dict[str, int]]:
+    """
+    Start gunicorn, warm every worker up, and read the memory of each worker
+
+    :param count: number of warm-up requests
+    :type count: int
+    :param workers: number of workers
+    :type workers: int
+    :param preload: whether the master preloads the database
+    :type preload: bool
+    :return: memory of each worker
+    :rtype: list[dict[str, int]]
+    """
+    os.environ["ANIMEAPI_PRELOAD"] = "1" if preload else "0"
+    port = free_port()
+    process = start_server("wsgi", port, workers)
+    try:
+        # enough connections for the load to spread over every worker
+        asyncio.run(load(port, sample_paths(count), workers * 16))
+        return [memory(pid) for pid in children(process.pid)]
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run(count: int, workers: int = 4) -> None:
+    """
+    Print the memory of every worker with and without preloading
+
+    :param count: number of warm-up requests
+    :type count: int
+    :param workers: number of workers, defaults to 4
+    :type workers: int, optional
+    """
+    mib = 2**20
+    for preload in [False, True]:
+        sizes = measure(count, workers, preload)
+        label = "preloaded" if preload else "per worker"
+        uss: Union[float, int] = sum(size["uss"] for size in sizes) / len(sizes)
+        print(f"{label}: {len(sizes)} workers, average USS {uss / mib:.1f} MiB")
+        for index, size in enumerate(sizes):
+            print(f"  worker {index}: USS {size['uss'] / mib:.1f} MiB, "
+                  f"PSS {size['pss'] / mib:.1f} MiB, RSS {size['rss'] / mib:.1f} MiB")
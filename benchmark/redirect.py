@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: AGPL-3.0-only AND MIT
+
+"""Measure `/rd` throughput with and without the precomputed redirect table"""
+
+from itertools import cycle, islice
+from random import Random
+from time import perf_counter
+
+from api.index import VALID_TARGETS, app, get_snapshot
+from benchmark.lookup import sample_paths
+
+
+def sample_redirects(count: int, seed: int = 0) -> list[str]:
+    """
+    Draw `/rd` requests from lookup paths, each to a random target
+
+    :param count: number of requests to draw
+    :type count: int
+    :param seed: random seed, so runs are comparable, defaults to 0
+    :type seed: int, optional
+    :return: request paths with query strings
+    :rtype: list[str]
+    """
+    rng = Random(seed)
+    targets = sorted(VALID_TARGETS)
+    requests: list[str] = []
+    for path in sample_paths(count, seed):
+        _, platform, key = path.split("/", 2)
+        requests.append(f"/rd?from={platform}&id={key}&to={rng.choice(targets)}&raw=1")
+    return list(islice(cycle(requests), count))
+
+
+def measure(client, paths: list[str]) -> float:
+    """
+    Send every request once
+
+    :param client: Flask test client
+    :param paths: request paths
+    :type paths: list[str]
+    :return: requests per second
+    :rtype: float
+    """
+    start = perf_counter()
+    for path in paths:
+        client.get(path)
+    return len(paths) / (perf_counter() - start)
+
+
+def run(count: int) -> None:
+    """
+    Send `count` redirects through the table, then through records, and print
+    both throughputs
+
+    :param count: number of requests per pass
+    :type count: int
+    """
+    paths = sample_redirects(count)
+    client = app.test_client()
+    for path in paths[:10]:
+        client.get(path)
+    snapshot = get_snapshot()
+    if snapshot.redirects is None:
+        raise SystemExit("database/redirect.bin is missing, run the generator first")
+    table = measure(client, paths)
+    # detach the table, so redirects are built from records as before
+    redirects, snapshot._redirects = snapshot._redirects, None  # pylint: disable=protected-access
+    try:
+        records = measure(client, paths)
+    finally:
+        snapshot._redirects = redirects  # pylint: disable=protected-access
+    print(f"{count} redirects per pass")
+    print(f"redirect table: {table:.1f} requests/s")
+    print(f"from records:   {records:.1f} requests/s")
@@ -2,9 +2,87 @@
 
 from typing import Any
 
-from alive_progress import alive_bar  # type: ignore
-from const import pprint
-from prettyprint import Platform, Status
+from joiner import JoinSpec, join_sources
+from prettyprint import Platform
+
+ANITRAKT_TYPE_RANK = {'shows': 0, 'movies': 1}
+"""Rank of AniTrakt media types when a MAL ID has several entries, shows first"""
+
+
+def anitrakt_rank(anitrakt_item: dict[str, Any]) -> int:
+    """
+    Rank an AniTrakt entry among the entries of its MAL ID: shows before
+    movies, then the order of the source list
+
+    :param anitrakt_item: AniTrakt entry
+    :type anitrakt_item: dict[str, Any]
+    :return: rank, lowest is attached
+    :rtype: int
+    """
+    return ANITRAKT_TYPE_RANK.get(anitrakt_item.get('type', None), len(ANITRAKT_TYPE_RANK))
+
+
+def first_fribb_id(value: str | int | None) -> str | int | None:
+    """
+    Take the first ID of a Fribb's Animelists value, which lists every ID of
+    an entry spanning several IMDb titles or TMDB entries as a comma-separated
+    string
+
+    :param value: IMDb or TMDB value
+    :type value: str | int | None
+    :return: first ID, or the value itself if it is not a string
+    :rtype: str | int | None
+    """
+    if isinstance(value, str):
+        return value.split(",")[0].strip()
+    return value
+
+
+def fribb_tmdb(fbi: dict[str, Any]) -> int | None:
+    """
+    Get the TMDB ID of a Fribb's Animelists entry
+
+    :param fbi: Fribb's Animelists entry
+    :type fbi: dict[str, Any]
+    :return: first TMDB ID
+    :rtype: int | None
+    """
+    tmdb = first_fribb_id(fbi.get('themoviedb_id', None))
+    return int(tmdb) if isinstance(tmdb, str) else tmdb
+
+
+ARM_JOIN = JoinSpec(
+    name="ARM",
+    platform=Platform.ARM,
+    # the earliest ARM entry matching either ID links, by MAL ID on a tie
+    keys=[('myanimelist', 'mal_id'), ('anilist', 'anilist_id')],
+    fields={'shoboi': 'syobocal_tid', 'annict': 'annict_id'},
+    # AOD sets shikimori to the MAL ID, so both are filled together
+    fill={'anilist': 'anilist_id', 'myanimelist': 'mal_id', 'shikimori': 'mal_id'},
+)
+"""Join of kawaiioverflow/arm for Syoboi Calendar and Annict IDs"""
+
+ANITRAKT_JOIN = JoinSpec(
+    name="AniTrakt",
+    platform=Platform.ANITRAKT,
+    keys=[('myanimelist', 'mal_id')],
+    fields={'trakt': 'trakt_id', 'trakt_type': 'type', 'trakt_season': 'season'},
+    rank=anitrakt_rank,
+)
+"""Join of AniTrakt for Trakt IDs, ranked so the attached entry does not
+depend on the order tv.json and movies.json are merged"""
+
+FRIBB_JOIN = JoinSpec(
+    name="Fribb's Animelists",
+    platform=Platform.FRIBB,
+    keys=[('anidb', 'anidb_id')],
+    fields={
+        'imdb': lambda fbi: first_fribb_id(fbi.get('imdb_id', None)),
+        'themoviedb': fribb_tmdb,
+    },
+)
+"""Join of Fribb's Animelists for IMDb and TMDB IDs via AniDB"""
+
 
 def combine_arm(
     arm: list[dict[str, Any]],
@@ -20,61 +98,7 @@ def combine_arm(
     :return: AOD data
     :rtype: list[dict[str, Any]]
     """
-    linked = 0
-    with alive_bar(len(aod),
-                   title="Combining ARM data with AOD data",
-                   spinner=None) as bar:  # type: ignore
-        for item in aod:
-            myanimelist = item['myanimelist']
-            anilist = item['anilist']
-            # Skip if both myanimelist and anilist are null
-            if myanimelist is None and anilist is None:
-                item.update({
-                    'shoboi': None,
-                    'annict': None,
-                })
-                bar()
-                continue
-
-            # Check if mal_id and anilist_id exist in arm_data
-            for arm_item in arm:
-                mal_id = arm_item.get('mal_id', None)
-                anilist_id = arm_item.get('anilist_id', None)
-                syoboi = arm_item.get('syobocal_tid', None)
-                annict = arm_item.get('annict_id', None)
-                if myanimelist is not None and mal_id == myanimelist:
-                    # Combine the data from arm_item with the item in aod_data
-                    item.update({
-                        'shoboi': syoboi,
-                        'annict': annict,
-                        'anilist': anilist if anilist is not None else anilist_id,
-                    })
-
-                    linked += 1
-                    break
-                elif anilist is not None and anilist_id == anilist:
-                    # Combine the data from arm_item with the item in aod_data
-                    item.update({
-                        'shoboi': syoboi,
-                        'annict': annict,
-                        'myanimelist': myanimelist if myanimelist is not None else mal_id,
-                        'shikimori': myanimelist if myanimelist is not None else mal_id,
-                    })
-                    linked += 1
-                    break
-            bar()
-    pprint.print(
-        Platform.ARM,
-        Status.PASS,
-        "ARM data combined with AOD data.",
-        "Total linked data:",
-        f"{linked},",
-        "AOD data:",
-        f"{len(aod)}",
-        "ARM data:",
-        f"{len(arm)}",
-    )
-    return aod
+    return join_sources(aod, [(ARM_JOIN, arm)])
 
 
 def combine_anitrakt(
@@ -91,59 +115,7 @@ def combine_anitrakt(
     :return: AOD data
     :rtype: list[dict[str, Any]]
     """
-    linked = 0
-    with alive_bar(len(aod),
-                   title="Combining AniTrakt data with AOD data",
-                   spinner=None) as bar:  # type: ignore
-        for item in aod:
-            matched = False
-            myanimelist = item['myanimelist']
-            # Skip if both myanimelist and anilist are null
-            if myanimelist is None:
-                item.update({
-                    'trakt': None,
-                    'trakt_type': None,
-                    'trakt_season': None,
-                })
-                bar()
-                continue
-
-            # Check if mal_id and anilist_id exist in anitrakt_data
-            for anitrakt_item in anitrakt:
-                mal_id = anitrakt_item.get('mal_id', None)
-                trakt = anitrakt_item.get('trakt_id', None)
-                media_type = anitrakt_item.get('type', None)
-                media_season = anitrakt_item.get('season', None)
-                if myanimelist is not None and mal_id == myanimelist:
-                    # Combine the data from anitrakt_item with the item in aod_data
-                    item.update({
-                        'trakt': trakt,
-                        'trakt_type': media_type,
-                        'trakt_season': media_season,
-                    })
-                    linked += 1
-                    matched = True
-                    break
-
-            if not matched:
-                item.update({
-                    'trakt': None,
-                    'trakt_type': None,
-                    'trakt_season': None,
-                })
-            bar()
-    pprint.print(
-        Platform.ANITRAKT,
-        Status.PASS,
-        "AniTrakt data combined with AOD data.",
-        "Total linked data:",
-        f"{linked},",
-        "AOD data:",
-        f"{len(aod)}",
-        "AniTrakt data:",
-        f"{len(anitrakt)}",
-    )
-    return aod
+    return join_sources(aod, [(ANITRAKT_JOIN, anitrakt)])
 
 
 def combine_fribb(
@@ -161,55 +133,32 @@ def combine_fribb(
     :return: AOD data
     :rtype: list[dict[str, Any]]
     """
-    linked = 0
-    with alive_bar(len(aod),
-                   title="Combining Fribb's Animelists data with AOD data",
-                   spinner=None) as bar:  # type: ignore
-        for item in aod:
-            matched = False
-            anidb = item['anidb']
-            # Skip if anidb is null
-            if anidb is None:
-                item.update({
-                    'imdb': None,
-                    'themoviedb': None,
-                })
-                bar()
-                continue
-
-            # Check if anidb_id exist in fribb_data
-            for fbi in fribb:
-                anidb_id = fbi.get('anidb_id', None)
-                imdb = fbi.get('imdb_id', None)
-                tmdb: str | int | None = fbi.get('themoviedb_id', None)
-                if anidb is not None and anidb_id == anidb:
-                    # Combine the data from fribb_item with the item in aod_data
-                    data_fbi = {}
-                    data_fbi['imdb'] = imdb
-                    if isinstance(tmdb, str):
-                        tmdbl = tmdb.split(",")
-                        tmdb = int(tmdbl[0])
-                    data_fbi['themoviedb'] = tmdb
-                    item.update(data_fbi)
-                    linked += 1
-                    matched = True
-                    break
-
-            if not matched:
-                item.update({
-                    'imdb': None,
-                    'themoviedb': None,
-                })
-            bar()
-    pprint.print(
-        Platform.FRIBB,
-        Status.PASS,
-        "Fribb's Animelists data combined with AOD data.",
-        "Total linked data:",
-        f"{linked},",
-        "AOD data:",
-        f"{len(aod)}",
-        "Fribb's Animelists data:",
-        f"{len(fribb)}",
-    )
-    return aod
+    return join_sources(aod, [(FRIBB_JOIN, fribb)])
+
+
+def combine_all(
+    arm: list[dict[str, Any]],
+    anitrakt: list[dict[str, Any]],
+    fribb: list[dict[str, Any]],
+    aod: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    Combine ARM, AniTrakt, and Fribb's Animelists data with AOD data in a
+    single pass, ARM first so AniTrakt sees the MAL IDs ARM filled in
+
+    :param arm: ARM data
+    :type arm: list[dict[str, Any]]
+    :param anitrakt: AniTrakt data
+    :type anitrakt: list[dict[str, Any]]
+    :param fribb: Fribb's Animelists data
+    :type fribb: list[dict[str, Any]]
+    :param aod: AOD data
+    :type aod: list[dict[str, Any]]
+    :return: AOD data
+    :rtype: list[dict[str, Any]]
+    """
+    return join_sources(aod, [
+        (ARM_JOIN, arm),
+        (ANITRAKT_JOIN, anitrakt),
+        (FRIBB_JOIN, fribb),
+    ])
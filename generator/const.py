@@ -26,8 +26,10 @@ attribution = {
     "mainrepo": "https://github.com/nattadasu/animeApi/tree/v3",
     "updated": {
         "timestamp": 0,
-        "iso": ""
+        "iso": "",
+        "hash": ""
     },
+    "checksums": {},
     "contributors": [
         ""
     ],
@@ -71,18 +73,23 @@ attribution = {
         "animeplanet": r"/animeplanet/(?P<media_id>[\w\-]+)",
         "anisearch": r"/anisearch/(?P<media_id>\d+)",
         "annict": r"/annict/(?P<media_id>\d+)",
+        "complete": r"/complete",
+        "export_ndjson": r"/export.ndjson",
         "heartbeat": r"/(heartbeat|ping)",
         "imdb": r"/imdb/(?P<media_id>tt[\d]+)",
         "kaize": r"/kaize/(?P<media_id>[\w\-]+)",
         "kitsu": r"/kitsu/(?P<media_id>\d+)",
         "livechart": r"/livechart/(?P<media_id>\d+)",
+        "metrics": r"/metrics",
         "myanimelist": r"/myanimelist/(?P<media_id>\d+)",
         "nautiljon": r"/nautiljon/(?P<media_id>[\w\+!\-_\(\)\[\]]+)",
         "notify": r"/notify/(?P<media_id>[\w\-_]+)",
         "otakotaku": r"/otakotaku/(?P<media_id>\d+)",
+        "ready": r"/ready",
         "redirect": r"/(redirect|rd)",
         "repo": r"/",
         "schema": r"/schema(?:.json)?",
+        "search": r"/search",
         "shikimori": r"/shikimori/(?P<media_id>\d+)",
         "shoboi": r"/shoboi/(?P<media_id>\d+)",
         "silveryasha": r"/silveryasha/(?P<media_id>\d+)",
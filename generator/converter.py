@@ -5,7 +5,7 @@ from typing import Any, Union
 
 from alive_progress import alive_bar  # type: ignore
 from const import pprint
-from fuzzywuzzy import fuzz  # type: ignore
+from matcher import TitleMatcher
 from prettyprint import Platform, Status
 from slugify import slugify
 
@@ -75,32 +75,31 @@ def link_kaize_to_mal(
                 unlinked.append(kz_item)
             bar()
     # on unlinked, fuzzy search the title name
+    matcher = TitleMatcher([aod_item["title"] for aod_item in aod], 85)
     with alive_bar(len(unlinked),
                    title="Fuzzy match title from both databases",
                    spinner=None) as bar:  # type: ignore
         for item in unlinked:
             title = item["title"]
-            for aod_item in aod:
-                aod_title = aod_item["title"]
-                ratio = fuzz.ratio(title, aod_title)  # type: ignore
-                if ratio >= 85:
-                    kz_dat = {
-                        "anidb": aod_item["anidb"],
-                        "anilist": aod_item["anilist"],
-                        "animeplanet": aod_item["animeplanet"],
-                        "anisearch": aod_item["anisearch"],
-                        "kitsu": aod_item["kitsu"],
-                        "myanimelist": aod_item["myanimelist"],
-                        "notify": aod_item["notify"],
-                        "shikimori": aod_item["shikimori"],
-                    }
-                    item.update(kz_dat)
-                    kz_fixed.append(item)
-                    aod_item.update({
-                        "kaize": item["slug"],
-                        "kaize_id": None if item["kaize"] == 0 else item["kaize"],
-                    })
-                    break
+            row = matcher.match(title)
+            if row is not None:
+                aod_item = aod[row]
+                kz_dat = {
+                    "anidb": aod_item["anidb"],
+                    "anilist": aod_item["anilist"],
+                    "animeplanet": aod_item["animeplanet"],
+                    "anisearch": aod_item["anisearch"],
+                    "kitsu": aod_item["kitsu"],
+                    "myanimelist": aod_item["myanimelist"],
+                    "notify": aod_item["notify"],
+                    "shikimori": aod_item["shikimori"],
+                }
+                item.update(kz_dat)
+                kz_fixed.append(item)
+                aod_item.update({
+                    "kaize": item["slug"],
+                    "kaize_id": None if item["kaize"] == 0 else item["kaize"],
+                })
             bar()
     # load manual link data
     with open("database/raw/kaize_manual.json", "r", encoding="utf-8") as file:
@@ -250,27 +249,26 @@ def link_nautiljon_to_mal(
                 unlinked.append(nautiljon_item)
             bar()
     # fuzzy search the rest of unlinked data
+    matcher = TitleMatcher([aod_item["title"] for aod_item in aod], 90)
     with alive_bar(len(unlinked),
                    title="Fuzzy match title from both databases",
                    spinner=None) as bar:  # type: ignore
         for item in unlinked:
             title = item["title"]
-            for aod_item in aod:
-                aod_title = aod_item["title"]
-                ratio = fuzz.ratio(title, aod_title)  # type: ignore
-                if ratio >= 90:
-                    item.update({
-                        "anidb": aod_item["anidb"],
-                        "anilist": aod_item["anilist"],
-                        "kitsu": aod_item["kitsu"],
-                        "myanimelist": aod_item["myanimelist"],
-                    })
-                    nautiljon_fixed.append(item)
-                    aod_item.update({
-                        "nautiljon": item["slug"],
-                        "nautiljon_id": item["entry_id"],
-                    })
-                    break
+            row = matcher.match(title)
+            if row is not None:
+                aod_item = aod[row]
+                item.update({
+                    "anidb": aod_item["anidb"],
+                    "anilist": aod_item["anilist"],
+                    "kitsu": aod_item["kitsu"],
+                    "myanimelist": aod_item["myanimelist"],
+                })
+                nautiljon_fixed.append(item)
+                aod_item.update({
+                    "nautiljon": item["slug"],
+                    "nautiljon_id": item["entry_id"],
+                })
             bar()
     # remove fixed data from unlinked
     with alive_bar(len(nautiljon_fixed),
@@ -363,6 +361,7 @@ def link_otakotaku_to_mal(
                 unlinked.append(ot_item)
             bar()
     # on unlinked, fuzzy search the title name
+    matcher = TitleMatcher([aod_item["title"] for aod_item in aod], 90)
     with alive_bar(len(unlinked),
                    title="Fuzzy match title from both databases",
                    spinner=None) as bar:  # type: ignore
@@ -387,16 +386,14 @@ def link_otakotaku_to_mal(
             title = item["title"]
             for key, value in replace_dict.items():
                 title = title.replace(key, value)
-            for aod_item in aod:
-                aod_title = aod_item["title"]
-                ratio = fuzz.ratio(title, aod_title)  # type: ignore
-                if ratio >= 90:
-                    ot_dat = {
-                        "otakotaku": item["otakotaku"],
-                    }
-                    aod_item.update(ot_dat)
-                    ot_fixed.append(aod_item)
-                    break
+            row = matcher.match(title)
+            if row is not None:
+                aod_item = aod[row]
+                ot_dat = {
+                    "otakotaku": item["otakotaku"],
+                }
+                aod_item.update(ot_dat)
+                ot_fixed.append(aod_item)
             bar()
     # load manual link data
     with open("database/raw/otakotaku_manual.json", "r", encoding="utf-8") as file:
@@ -539,21 +536,20 @@ def link_silveryasha_to_mal(
                 unlinked.append(sy_item)
             bar()
     # on unlinked, fuzzy search the title name
+    matcher = TitleMatcher([aod_item["title"] for aod_item in aod], 95)
     with alive_bar(len(unlinked),
                    title="Fuzzy match title from both databases",
                    spinner=None) as bar:  # type: ignore
         for item in unlinked:
             title = item["title"]
-            for aod_item in aod:
-                aod_title = aod_item["title"]
-                ratio = fuzz.ratio(title, aod_title)  # type: ignore
-                if ratio >= 95:
-                    sy_dat = {
-                        "silveryasha": item["silveryasha"],
-                    }
-                    aod_item.update(sy_dat)
-                    sy_fixed.append(aod_item)
-                    break
+            row = matcher.match(title)
+            if row is not None:
+                aod_item = aod[row]
+                sy_dat = {
+                    "silveryasha": item["silveryasha"],
+                }
+                aod_item.update(sy_dat)
+                sy_fixed.append(aod_item)
             bar()
     # load manual link data
     with open("database/raw/silveryasha_manual.json", "r", encoding="utf-8") as file:
@@ -1,11 +1,18 @@
 # SPDX-License-Identifier: AGPL-3.0-only AND MIT
 
 import csv
+import gzip
+import hashlib
 import json
+import os
 import re
+import sqlite3
+import struct
+import unicodedata
 from datetime import datetime, timezone
 from typing import Any
 
+import brotli  # type: ignore
 import requests
 from alive_progress import alive_bar  # type: ignore
 from const import pprint
@@ -37,7 +44,342 @@ def populate_contributors(attr: dict[str, Any]) -> dict[str, Any]:
     return attr
 
 
-def save_to_file(data: list[dict[str, Any]], platform: str, attr: dict[str, Any]) -> None:
+BINARY_MAGIC = b"ANIMEAPI"
+"""Magic bytes at the start of every binary lookup file"""
+BINARY_VERSION = 1
+"""Binary lookup file format version, bump on incompatible changes"""
+BINARY_HEADER = struct.Struct("<8sII")
+"""Binary lookup file header: magic, version, and entry count"""
+
+REDIRECT_TARGETS: dict[str, tuple[str, str]] = {
+    "anidb": ("https://anidb.net/anime/", "anidb"),
+    "anilist": ("https://anilist.co/anime/", "anilist"),
+    "animeplanet": ("https://www.anime-planet.com/anime/", "animeplanet"),
+    "anisearch": ("https://www.anisearch.com/anime/", "anisearch"),
+    "annict": ("https://annict.com/works/", "annict"),
+    "imdb": ("https://www.imdb.com/title/", "imdb"),
+    "kaize": ("https://kaize.io/anime/", "kaize"),
+    "kitsu": ("https://kitsu.app/anime/", "kitsu"),
+    "kurozora": ("https://kurozora.app/myanimelist.net/anime/", "myanimelist"),
+    "livechart": ("https://www.livechart.me/anime/", "livechart"),
+    "myanimelist": ("https://myanimelist.net/anime/", "myanimelist"),
+    "nautiljon": ("https://www.nautiljon.com/animes/", "nautiljon"),
+    "notify": ("https://notify.moe/anime/", "notify"),
+    "otakotaku": ("https://otakotaku.com/anime/view/", "otakotaku"),
+    "shikimori": ("https://shikimori.one/animes/", "shikimori"),
+    "shoboi": ("https://cal.syoboi.jp/tid/", "shoboi"),
+    "silveryasha": ("https://db.silveryasha.web.id/anime/", "silveryasha"),
+    "themoviedb": ("https://www.themoviedb.org/movie/", "themoviedb"),
+    "trakt": ("https://trakt.tv/", "trakt"),
+    "simkl": ("https://api.simkl.com/redirect?to=Simkl&anidb=", "anidb"),
+    "letterboxd": ("https://letterboxd.com/tmdb/", "themoviedb"),
+}
+"""Redirect targets of the API, with their URI prefix and the record field the
+ID comes from, in the column order of database/redirect.bin. Keep in sync with
+`route_path` in api/index.py"""
+
+COMPLETION_PLATFORMS = ["animeplanet", "kaize", "nautiljon", "notify"]
+"""Platforms keyed by slugs, completed by the API alongside titles"""
+
+NON_WORD = re.compile(r"[\W_]+")
+"""Runs of characters other than letters and digits, ignored by completions.
+Keep in sync with `NON_WORD` in api/index.py"""
+
+
+def serialize_record(item: dict[str, Any]) -> bytes:
+    """
+    Serialize a record exactly like the API's JSON responses, so the bytes can
+    be served as-is
+
+    :param item: record
+    :type item: dict[str, Any]
+    :return: JSON bytes, newline terminated
+    :rtype: bytes
+    """
+    return json.dumps(item, sort_keys=True, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def write_atomic(file_path: str, content: bytes) -> None:
+    """
+    Write a file through a temporary file, so readers that have the old file
+    opened or memory-mapped never see it half-written
+
+    :param file_path: file path
+    :type file_path: str
+    :param content: file content
+    :type content: bytes
+    :return: None
+    :rtype: None
+    """
+    with open(f"{file_path}.tmp", "wb") as file:
+        file.write(content)
+    os.replace(f"{file_path}.tmp", file_path)
+    return None
+
+
+def file_checksum(file_path: str) -> str:
+    """
+    Hash a file with SHA-256 without reading it into memory at once
+
+    :param file_path: file path
+    :type file_path: str
+    :return: hex digest
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_compressed(file_path: str) -> None:
+    """
+    Save gzip and brotli variants of a file next to it, as `{file_path}.gz` and
+    `{file_path}.br`, for the API to serve by `Accept-Encoding`
+
+    :param file_path: file path
+    :type file_path: str
+    :return: None
+    :rtype: None
+    """
+    with open(file_path, "rb") as file:
+        content = file.read()
+    # mtime=0 keeps the gzip output identical for identical input
+    write_atomic(f"{file_path}.gz", gzip.compress(content, compresslevel=9, mtime=0))
+    # quality 10 is within 2% of 11 on our files, at half the time
+    write_atomic(f"{file_path}.br", brotli.compress(content, quality=10))  # type: ignore
+    return None
+
+
+def save_binary_records(data: list[dict[str, Any]]) -> dict[int, int]:
+    """
+    Save pre-serialized records to database/animeapi.bin
+
+    Layout, little-endian: header, (count + 1) uint32 offsets into the record
+    blob, then the blob of records serialized by `serialize_record`
+
+    :param data: data to save
+    :type data: list[dict[str, Any]]
+    :return: row number of each record, keyed by the record's id()
+    :rtype: dict[int, int]
+    """
+    rows = {id(item): row for row, item in enumerate(data)}
+    write_atomic(
+        "database/animeapi.bin",
+        pack_binary_records([serialize_record(item) for item in data]),
+    )
+    return rows
+
+
+def pack_binary_records(records: list[bytes]) -> bytes:
+    """
+    Pack records into the layout of database/animeapi.bin: header,
+    (count + 1) uint32 offsets into the blob, then the blob itself
+
+    :param records: records, in row order
+    :type records: list[bytes]
+    :return: file content
+    :rtype: bytes
+    """
+    offsets: list[int] = [0]
+    blob = bytearray()
+    for record in records:
+        blob += record
+        offsets.append(len(blob))
+    header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(records))
+    table = struct.pack(f"<{len(offsets)}I", *offsets)
+    return header + table + blob
+
+
+def redirect_uri(item: dict[str, Any], target: str) -> str:
+    """
+    Build the URI the API redirects a record to on a target platform
+
+    :param item: record
+    :type item: dict[str, Any]
+    :param target: target platform, a key of `REDIRECT_TARGETS`
+    :type target: str
+    :return: URI, empty if the record can not be redirected to the target
+    :rtype: str
+    """
+    prefix, field = REDIRECT_TARGETS[target]
+    value = item.get(field)
+    if not value:
+        return ""
+    if target != "trakt":
+        return f"{prefix}{value}"
+    season = item.get("trakt_season")
+    if not season:
+        return f"{prefix}{item['trakt_type']}/{value}"
+    return f"{prefix}{item['trakt_type']}/{value}/seasons/{season}"
+
+
+def save_redirect_table(data: list[dict[str, Any]]) -> None:
+    """
+    Save the redirect URIs of every record to database/redirect.bin, so the
+    API answers a redirect by slicing one row instead of building the URI
+
+    Same layout as database/animeapi.bin, row numbers included. Each row holds
+    the URIs of the record on every target in `REDIRECT_TARGETS` order,
+    tab-separated, and an extra last row lists the target names so the API can
+    tell whether its columns still match
+
+    :param data: data to save, sorted by title
+    :type data: list[dict[str, Any]]
+    :return: None
+    :rtype: None
+    """
+    records = [
+        "\t".join(redirect_uri(item, target) for target in REDIRECT_TARGETS).encode("utf-8")
+        for item in data
+    ]
+    records.append("\t".join(REDIRECT_TARGETS).encode("utf-8"))
+    write_atomic("database/redirect.bin", pack_binary_records(records))
+    return None
+
+
+def save_binary_index(
+    obj_data: dict[str, dict[str, Any]],
+    rows: dict[int, int],
+    platform: str,
+) -> None:
+    """
+    Save a platform's ID index to database/{platform}.bin
+
+    Layout, little-endian: header, (count + 1) uint32 offsets into the key
+    blob, count uint32 row numbers into database/animeapi.bin, then the blob
+    of UTF-8 keys sorted bytewise so the API can binary search it
+
+    :param obj_data: object-formatted data, as saved to {platform}_object.json
+    :type obj_data: dict[str, dict[str, Any]]
+    :param rows: row numbers returned by `save_binary_records`
+    :type rows: dict[int, int]
+    :param platform: platform name
+    :type platform: str
+    :return: None
+    :rtype: None
+    """
+    entries = [(f"{key}".encode("utf-8"), rows[id(item)]) for key, item in obj_data.items()]
+    write_atomic(f"database/{platform}.bin", pack_binary_index(entries))
+    return None
+
+
+def pack_binary_index(entries: list[tuple[bytes, int]]) -> bytes:
+    """
+    Pack keys and their rows into the layout of database/{platform}.bin:
+    header, (count + 1) uint32 offsets into the key blob, count uint32 row
+    numbers, then the blob of keys sorted bytewise
+
+    :param entries: key and row number of every entry, in any order
+    :type entries: list[tuple[bytes, int]]
+    :return: file content
+    :rtype: bytes
+    """
+    entries = sorted(entries)
+    offsets: list[int] = [0]
+    blob = bytearray()
+    for key, _ in entries:
+        blob += key
+        offsets.append(len(blob))
+    header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(entries))
+    table = struct.pack(f"<{len(offsets)}I", *offsets)
+    row_table = struct.pack(f"<{len(entries)}I", *(row for _, row in entries))
+    return header + table + row_table + blob
+
+
+def completion_key(text: str) -> bytes:
+    """
+    Normalize a title or slug for prefix completion: width and case folded,
+    with anything other than letters and digits turned into single spaces
+
+    :param text: title or slug
+    :type text: str
+    :return: normalized UTF-8 key
+    :rtype: bytes
+    """
+    folded = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(NON_WORD.split(folded)).strip().encode("utf-8")
+
+
+def save_completion_index(entries: list[tuple[str, int]], name: str) -> None:
+    """
+    Save a prefix completion index to database/complete_{name}.bin, in the
+    layout of database/{platform}.bin with keys normalized by
+    `completion_key`, so the API completes a prefix by binary searching its
+    first match and reading the following keys
+
+    :param entries: title or slug and row number of every entry
+    :type entries: list[tuple[str, int]]
+    :param name: "title", or a platform in `COMPLETION_PLATFORMS`
+    :type name: str
+    :return: None
+    :rtype: None
+    """
+    write_atomic(
+        f"database/complete_{name}.bin",
+        pack_binary_index([(completion_key(text), row) for text, row in entries]),
+    )
+    return None
+
+
+def save_sqlite(data: list[dict[str, Any]], platforms: list[str]) -> None:
+    """
+    Save data to database/animeapi.sqlite, one `anime` table of records with an
+    indexed column per platform ID
+
+    Platform columns, with trakt's type and season, hold IDs as text the same
+    way they are keyed in the object files, the `row` column follows the order
+    of `data`, and `record` holds the pre-serialized record so it can be served
+    as-is
+
+    :param data: data to save, sorted by title
+    :type data: list[dict[str, Any]]
+    :param platforms: platform names
+    :type platforms: list[str]
+    :return: None
+    :rtype: None
+    """
+    fields = list(data[0].keys())
+    text_fields = [*platforms, "title", "trakt_type", "trakt_season"]
+    columns = ", ".join(
+        f'"{field}" TEXT' if field in text_fields else f'"{field}"'
+        for field in fields
+    )
+    file_path = "database/animeapi.sqlite"
+    if os.path.exists(f"{file_path}.tmp"):
+        os.remove(f"{file_path}.tmp")
+    conn = sqlite3.connect(f"{file_path}.tmp")
+    try:
+        conn.execute(
+            f"CREATE TABLE anime (row INTEGER PRIMARY KEY, {columns}, record BLOB NOT NULL)")
+        placeholders = ", ".join("?" * (len(fields) + 2))
+        conn.executemany(
+            f"INSERT INTO anime VALUES ({placeholders})",
+            (
+                (row, *(item.get(field) for field in fields), serialize_record(item))
+                for row, item in enumerate(data)
+            ),
+        )
+        for plat in platforms:
+            if plat == "trakt":
+                conn.execute(
+                    "CREATE INDEX ix_trakt ON anime (trakt_type, trakt, trakt_season)")
+            else:
+                conn.execute(f'CREATE INDEX "ix_{plat}" ON anime ("{plat}")')
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(f"{file_path}.tmp", file_path)
+    return None
+
+
+def save_to_file(
+    data: list[dict[str, Any]],
+    platform: str,
+    attr: dict[str, Any],
+    rows: dict[int, int] | None = None,
+) -> None:
     """
     Save data to file
 
@@ -47,6 +389,9 @@ def save_to_file(data: list[dict[str, Any]], platform: str, attr: dict[str, Any]
     :type platform: str
     :param attr: attribution dict
     :type attr: dict[str, Any]
+    :param rows: row numbers from `save_binary_records`, to also save the
+        binary lookup index of the platform, defaults to None
+    :type rows: dict[int, int] | None, optional
     :return: None
     :rtype: None
     """
@@ -60,8 +405,7 @@ def save_to_file(data: list[dict[str, Any]], platform: str, attr: dict[str, Any]
             if pkey is not None:
                 items.append(item)
             bar()
-    with open(f"database/{platform}.json", "w", encoding="utf-8") as file:
-        json.dump(items, file)
+    write_atomic(f"database/{platform}.json", json.dumps(items).encode("utf-8"))
     # save object-formatted data to file
     obj_data: dict[str, dict[str, Any]] = {}
     with alive_bar(len(items),
@@ -80,8 +424,13 @@ def save_to_file(data: list[dict[str, Any]], platform: str, attr: dict[str, Any]
             elif platform == "themoviedb":
                 obj_data[f"movie/{item['themoviedb']}"] = item
             bar()
-    with open(f"database/{platform}_object.json", "w", encoding="utf-8") as file:
-        json.dump(obj_data, file)
+    write_atomic(f"database/{platform}_object.json", json.dumps(obj_data).encode("utf-8"))
+    if rows is not None:
+        save_binary_index(obj_data, rows, platform)
+        if platform in COMPLETION_PLATFORMS:
+            save_completion_index(
+                [(f"{key}", rows[id(item)]) for key, item in obj_data.items()], platform
+            )
     # update attr
     attr["counts"][f"{platform}"] = len(items)  # type: ignore
     return None
@@ -125,6 +474,30 @@ def save_platform_loop(data: list[dict[str, Any]], attr: dict[str, Any]) -> dict
         "Sorting data by title",
     )
     data = sorted(data, key=lambda k: k["title"])
+    pprint.print(
+        Platform.SYSTEM,
+        Status.INFO,
+        "Saving pre-serialized records to animeapi.bin",
+    )
+    rows = save_binary_records(data)
+    pprint.print(
+        Platform.SYSTEM,
+        Status.INFO,
+        "Saving redirect URIs to redirect.bin",
+    )
+    save_redirect_table(data)
+    pprint.print(
+        Platform.SYSTEM,
+        Status.INFO,
+        "Saving title completion index to complete_title.bin",
+    )
+    save_completion_index([(item["title"], row) for row, item in enumerate(data)], "title")
+    pprint.print(
+        Platform.SYSTEM,
+        Status.INFO,
+        "Saving records to animeapi.sqlite",
+    )
+    save_sqlite(data, platforms)
     for plat in platforms:
         match plat:
             case "anidb":
@@ -170,7 +543,7 @@ def save_platform_loop(data: list[dict[str, Any]], attr: dict[str, Any]) -> dict
             Status.INFO,
             f"Saving data to {plat}.json",
         )
-        save_to_file(data, plat, attr)
+        save_to_file(data, plat, attr, rows)
     return attr
 
 
@@ -185,7 +558,7 @@ def save_list_to_tsv(data: list[dict[str, Any]], file_path: str) -> None:
     :return: None
     :rtype: None
     """
-    with open(f"{file_path}.tsv", "w", encoding="utf-8", newline="") as file_:
+    with open(f"{file_path}.tsv.tmp", "w", encoding="utf-8", newline="") as file_:
         writer = csv.writer(file_, delimiter="\t", lineterminator="\n")
         writer.writerow(data[0].keys())
         with alive_bar(len(data),
@@ -194,6 +567,7 @@ def save_list_to_tsv(data: list[dict[str, Any]], file_path: str) -> None:
             for item in data:
                 writer.writerow(item.values())
                 bar()
+    os.replace(f"{file_path}.tsv.tmp", f"{file_path}.tsv")
     return None
 
 
@@ -213,14 +587,22 @@ def update_attribution(data: list[dict[str, Any]], attr: dict[str, Any]) -> dict
         Status.INFO,
         "Save data to JSON",
     )
-    with open("database/animeapi.json", "w", encoding="utf-8") as file_:
-        json.dump(data, file_)
+    content = json.dumps(data).encode("utf-8")
+    write_atomic("database/animeapi.json", content)
+    content_hash = hashlib.sha256(content).hexdigest()
     pprint.print(
         Platform.SYSTEM,
         Status.INFO,
         "Save data to TSV",
     )
     save_list_to_tsv(data, "database/animeapi")
+    pprint.print(
+        Platform.SYSTEM,
+        Status.INFO,
+        "Compressing JSON and TSV with gzip and brotli",
+    )
+    save_compressed("database/animeapi.json")
+    save_compressed("database/animeapi.tsv")
 
     pprint.print(
         Platform.SYSTEM,
@@ -230,14 +612,25 @@ def update_attribution(data: list[dict[str, Any]], attr: dict[str, Any]) -> dict
     now = datetime.now(tz=timezone.utc)
     attr["updated"]["iso"] = now.isoformat()  # type: ignore
     attr["updated"]["timestamp"] = int(now.timestamp())  # type: ignore
+    # content hash of the build, used by the API as its ETag
+    attr["updated"]["hash"] = content_hash  # type: ignore
     attr = populate_contributors(attr)
 
     total_data = len(data)
     attr = save_platform_loop(data, attr)
 
     attr["counts"]["total"] = total_data  # type: ignore
-    with open("api/status.json", "w", encoding="utf-8") as file:
-        json.dump(attr, file)
+    # checksums of the files the API loads, for its deep readiness check
+    attr["checksums"] = {
+        file_name: file_checksum(f"database/{file_name}")
+        for file_name in [
+            "animeapi.json", "animeapi.tsv", "animeapi.bin", "redirect.bin",
+            "animeapi.sqlite", *(f"{plat}.bin" for plat in attr["counts"] if plat != "total"),
+            "complete_title.bin", *(f"complete_{plat}.bin" for plat in COMPLETION_PLATFORMS),
+        ]
+    }
+    # written last, the API reloads once it sees a new status file
+    write_atomic("api/status.json", json.dumps(attr).encode("utf-8"))
     pprint.print(
         Platform.SYSTEM,
         Status.PASS,
@@ -0,0 +1,250 @@
+# SPDX-License-Identifier: AGPL-3.0-only AND MIT
+
+from typing import Any, Callable
+
+from alive_progress import alive_bar  # type: ignore
+from const import pprint
+from prettyprint import Platform, Status
+
+Field = str | Callable[[dict[str, Any]], Any]
+"""Source field name, or a function computing the value from a source entry"""
+
+
+class JoinSpec:
+    """Declarative description of how a mapping source joins into AOD data"""
+
+    def __init__(
+        self,
+        name: str,
+        platform: Platform,
+        keys: list[tuple[str, str]],
+        fields: dict[str, Field],
+        fill: dict[str, Field] | None = None,
+        rank: Callable[[dict[str, Any]], Any] | None = None,
+        policy: str = "earliest",
+    ) -> None:
+        """
+        Describe a join
+
+        :param name: source name, as printed in the link statistics
+        :type name: str
+        :param platform: platform the statistics are printed as
+        :type platform: Platform
+        :param keys: AOD field and source field of every key, the primary key
+            first, then its fallbacks
+        :type keys: list[tuple[str, str]]
+        :param fields: AOD fields set from a linked entry, and to None when no
+            entry links
+        :type fields: dict[str, Field]
+        :param fill: AOD fields set from a linked entry only when they are
+            None, defaults to None
+        :type fill: dict[str, Field] | None, optional
+        :param rank: sort key of the entries sharing a key value, lowest
+            links, ties and unranked sources go by source order, defaults to
+            None
+        :type rank: Callable[[dict[str, Any]], Any] | None, optional
+        :param policy: conflict policy between keys, "earliest" links the
+            best ranked entry matching any key, ties going to the earlier
+            key, "key_order" links the best entry of the first key that
+            matches, defaults to "earliest"
+        :type policy: str, optional
+        """
+        if policy not in ("earliest", "key_order"):
+            raise ValueError(f"Unknown join policy: {policy}")
+        self.name = name
+        self.platform = platform
+        self.keys = keys
+        self.fields = fields
+        self.fill = fill or {}
+        self.rank = rank
+        self.policy = policy
+
+
+def field_value(entry: dict[str, Any], field: Field) -> Any:
+    """
+    Get the value a field mapping takes from a source entry
+
+    :param entry: source entry
+    :type entry: dict[str, Any]
+    :param field: source field name, or a function of the entry
+    :type field: Field
+    :return: value
+    :rtype: Any
+    """
+    if callable(field):
+        return field(entry)
+    return entry.get(field, None)
+
+
+class JoinIndex:
+    """
+    Hash indexes of one source, built once, holding the best ranked entry of
+    every key value and the values of the entries linked so far
+    """
+
+    def __init__(self, spec: JoinSpec, source: list[dict[str, Any]]) -> None:
+        """
+        Index a source
+
+        :param spec: join description
+        :type spec: JoinSpec
+        :param source: source entries
+        :type source: list[dict[str, Any]]
+        """
+        self.spec = spec
+        self.source = source
+        self.best: list[dict[Any, Any]] = [{} for _ in spec.keys]
+        """Rank of the best entry of every key value, per key: the row, or
+        the spec's rank and the row for ranked sources"""
+        self.candidates: list[dict[Any, int]] = [{} for _ in spec.keys]
+        """Number of entries sharing every key value, per key"""
+        self.values: dict[int, tuple[dict[str, Any], dict[str, Any]]] = {}
+        """Set and fill values of linked rows, mapped on first link"""
+        for row, entry in enumerate(source):
+            rank = row if spec.rank is None else (spec.rank(entry), row)
+            for position, (_, source_field) in enumerate(spec.keys):
+                value = entry.get(source_field, None)
+                if value is None:
+                    continue
+                best = self.best[position]
+                if value not in best or rank < best[value]:
+                    best[value] = rank
+                self.candidates[position][value] = self.candidates[position].get(value, 0) + 1
+        self.defaults: dict[str, Any] = {field: None for field in spec.fields}
+        self.linked = 0
+        self.ambiguous = 0
+        self.linked_by: list[int] = [0 for _ in spec.keys]
+
+    def resolve(self, item: dict[str, Any]) -> tuple[int, int, Any] | None:
+        """
+        Find the entry an AOD item links to
+
+        :param item: AOD item
+        :type item: dict[str, Any]
+        :return: row of the entry, position of the key it links by, and the
+            key value, or None
+        :rtype: tuple[int, int, Any] | None
+        """
+        found: tuple[Any, int, Any] | None = None
+        for position, (aod_field, _) in enumerate(self.spec.keys):
+            value = item.get(aod_field, None)
+            if value is None:
+                continue
+            rank = self.best[position].get(value, None)
+            if rank is None:
+                continue
+            if self.spec.policy == "key_order":
+                return self.row(rank), position, value
+            if found is None or rank < found[0]:
+                found = (rank, position, value)
+        if found is None:
+            return None
+        return self.row(found[0]), found[1], found[2]
+
+    def row(self, rank: Any) -> int:
+        """
+        Get the row of a rank kept in `best`
+
+        :param rank: rank
+        :type rank: Any
+        :return: row
+        :rtype: int
+        """
+        return rank if self.spec.rank is None else rank[1]
+
+    def mapped(self, row: int) -> tuple[dict[str, Any], dict[str, Any]]:
+        """
+        Get the values an entry sets and fills, mapped once per entry
+
+        :param row: row of the entry
+        :type row: int
+        :return: set and fill values
+        :rtype: tuple[dict[str, Any], dict[str, Any]]
+        """
+        values = self.values.get(row, None)
+        if values is None:
+            entry = self.source[row]
+            values = (
+                {field: field_value(entry, mapping) for field, mapping in self.spec.fields.items()},
+                {field: field_value(entry, mapping) for field, mapping in self.spec.fill.items()},
+            )
+            self.values[row] = values
+        return values
+
+    def apply(self, item: dict[str, Any]) -> None:
+        """
+        Join the linked entry into an AOD item, or reset the fields it sets
+
+        :param item: AOD item, updated in place
+        :type item: dict[str, Any]
+        """
+        match = self.resolve(item)
+        if match is None:
+            item.update(self.defaults)
+            return
+        row, position, key = match
+        values, fill = self.mapped(row)
+        item.update(values)
+        for field, value in fill.items():
+            if item.get(field, None) is None:
+                item[field] = value
+        self.linked += 1
+        self.linked_by[position] += 1
+        if self.candidates[position][key] > 1:
+            self.ambiguous += 1
+
+    def report(self, total: int) -> None:
+        """
+        Print the link statistics of the source
+
+        :param total: number of AOD items
+        :type total: int
+        """
+        by_key = ", ".join(
+            f"{aod_field} {count}"
+            for (aod_field, _), count in zip(self.spec.keys, self.linked_by)
+        )
+        pprint.print(
+            self.spec.platform,
+            Status.PASS,
+            f"{self.spec.name} data combined with AOD data.",
+            "Total linked data:",
+            f"{self.linked},",
+            "AOD data:",
+            f"{total}",
+            f"{self.spec.name} data:",
+            f"{len(self.source)},",
+            "Linked by:",
+            f"{by_key},",
+            "Linked with several candidates:",
+            f"{self.ambiguous}",
+        )
+
+
+def join_sources(
+    aod: list[dict[str, Any]],
+    joins: list[tuple[JoinSpec, list[dict[str, Any]]]],
+) -> list[dict[str, Any]]:
+    """
+    Join mapping sources into AOD data in a single pass, applying the joins
+    of every item in order, so a join sees the fields earlier ones filled
+
+    :param aod: AOD data
+    :type aod: list[dict[str, Any]]
+    :param joins: join description and entries of every source
+    :type joins: list[tuple[JoinSpec, list[dict[str, Any]]]]
+    :return: AOD data
+    :rtype: list[dict[str, Any]]
+    """
+    indexes = [JoinIndex(spec, source) for spec, source in joins]
+    names = ", ".join(spec.name for spec, _ in joins)
+    with alive_bar(len(aod),
+                   title=f"Combining {names} data with AOD data",
+                   spinner=None) as bar:  # type: ignore
+        for item in aod:
+            for index in indexes:
+                index.apply(item)
+            bar()
+    for index in indexes:
+        index.report(len(aod))
+    return aod
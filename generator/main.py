@@ -1,13 +1,12 @@
 # SPDX-License-Identifier: AGPL-3.0-only AND MIT
 
-import json
 from time import time
 from typing import Any
 
 from alive_progress import alive_bar  # type: ignore
 from const import (KAIZE_EMAIL, KAIZE_PASSWORD, KAIZE_SESSION,
                    KAIZE_XSRF_TOKEN, attribution, pprint)
-from combiner import combine_anitrakt, combine_arm, combine_fribb
+from combiner import combine_all
 from converter import (link_kaize_to_mal, link_nautiljon_to_mal,
                        link_otakotaku_to_mal, link_silveryasha_to_mal)
 from dumper import update_attribution, update_markdown
@@ -58,15 +57,9 @@ def main() -> None:
         pprint.print(Platform.SILVERYASHA, Status.BUILD,
                      "Linking SilverYasha ID to MyAnimeList ID")
         aod_arr = link_silveryasha_to_mal(sy_, aod_arr)
-        pprint.print(Platform.ARM, Status.BUILD,
-                     "Combining ARM data with AOD data")
-        aod_arr = combine_arm(arm, aod_arr)
-        pprint.print(Platform.ANITRAKT, Status.BUILD,
-                     "Combining AniTrakt data with AOD data")
-        aod_arr = combine_anitrakt(anitrakt, aod_arr)
-        pprint.print(Platform.FRIBB, Status.BUILD,
-                     "Combining Fribb's Animelists data with AOD data")
-        aod_arr = combine_fribb(fribb, aod_arr)
+        pprint.print(Platform.SYSTEM, Status.BUILD,
+                     "Combining ARM, AniTrakt, and Fribb's Animelists data with AOD data")
+        aod_arr = combine_all(arm, anitrakt, fribb, aod_arr)
         final_arr: list[dict[str, Any]] = []
         with alive_bar(len(aod_arr),
                        title="Fixing missing keys",
@@ -101,9 +94,6 @@ def main() -> None:
                 }
                 final_arr.append(data)
                 bar()
-        with open("database/animeapi.json", "w", encoding="utf-8") as file:
-            json.dump(final_arr, file)
-
         attr = update_attribution(final_arr, attribution)
         attr = update_markdown(attr=attr)
         counts: dict[str, int] = attr["counts"]  # type: ignore
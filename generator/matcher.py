@@ -0,0 +1,197 @@
+# SPDX-License-Identifier: AGPL-3.0-only AND MIT
+
+from collections import Counter
+
+from fuzzywuzzy import fuzz  # type: ignore
+
+GRAM_SIZE = 3
+"""Length of the n-grams titles are indexed by. Bigrams block more titles at
+85%, but their postings are long enough that reading them costs more than
+scoring the extra titles trigrams let through"""
+
+
+def title_grams(title: str, size: int = GRAM_SIZE) -> Counter[str]:
+    """
+    Count the n-grams of a title
+
+    :param title: title, compared as is like `fuzz.ratio` does
+    :type title: str
+    :param size: n-gram length, defaults to GRAM_SIZE
+    :type size: int, optional
+    :return: occurrences of every n-gram
+    :rtype: Counter[str]
+    """
+    return Counter(title[i:i + size] for i in range(len(title) - size + 1))
+
+
+def min_common(length: int, other: int, threshold: int) -> int | None:
+    """
+    Get the least number of characters two titles of the given lengths
+    share, in order, to score `threshold` in `fuzz.ratio`
+
+    Both backends of `fuzz.ratio` score at most 2 * LCS / (length + other),
+    rounded, so this bound never rejects a pair that scores `threshold`.
+
+    :param length: length of a title
+    :type length: int
+    :param other: length of the other title
+    :type other: int
+    :param threshold: least ratio, from 0 to 100
+    :type threshold: int
+    :return: least longest common subsequence, or None if the lengths are
+        too far apart to ever score `threshold`
+    :rtype: int | None
+    """
+    # ceil((threshold - 0.5) * (length + other) / 200), as ratios round
+    common = -(-(2 * threshold - 1) * (length + other) // 400)
+    return common if common <= min(length, other) else None
+
+
+def min_shared_grams(length: int, other: int, common: int, size: int = GRAM_SIZE) -> int:
+    """
+    Get the least number of n-grams two titles share when their longest
+    common subsequence is `common` characters long
+
+    Deleting a character breaks at most `size` n-grams of a title, inserting
+    one breaks at most `size - 1`, and every n-gram left untouched on the
+    way from one title to the other is shared.
+
+    :param length: length of a title
+    :type length: int
+    :param other: length of the other title
+    :type other: int
+    :param common: least longest common subsequence
+    :type common: int
+    :param size: n-gram length, defaults to GRAM_SIZE
+    :type size: int, optional
+    :return: least shared n-grams, zero or less when the bound prunes nothing
+    :rtype: int
+    """
+    def kept(source: int, target: int) -> int:
+        return source - size + 1 - size * (source - common) - (size - 1) * (target - common)
+    return max(kept(length, other), kept(other, length))
+
+
+class TitleMatcher:
+    """
+    Find the first title scoring a threshold in `fuzz.ratio` without scoring
+    every title: an n-gram inverted index and length bounds derived from the
+    threshold block out titles that cannot score it, and only the rest are
+    scored, in their original order
+    """
+
+    def __init__(self, titles: list[str], threshold: int, size: int = GRAM_SIZE) -> None:
+        """
+        Index titles
+
+        :param titles: titles to match against, in priority order
+        :type titles: list[str]
+        :param threshold: least ratio a match scores, from 0 to 100
+        :type threshold: int
+        :param size: n-gram length, defaults to GRAM_SIZE
+        :type size: int, optional
+        """
+        self.titles = titles
+        self.threshold = threshold
+        self.size = size
+        self.by_length: dict[int, list[int]] = {}
+        """Rows of the titles of every length"""
+        self.postings: dict[str, dict[int, list[int]]] = {}
+        """Rows of the titles containing an n-gram, by title length"""
+        self.frequency: Counter[str] = Counter()
+        """Number of titles containing every n-gram"""
+        self.grams: list[frozenset[str]] = []
+        """Distinct n-grams of every title"""
+        for row, title in enumerate(titles):
+            length = len(title)
+            self.by_length.setdefault(length, []).append(row)
+            grams = title_grams(title, size)
+            for gram in grams:
+                self.postings.setdefault(gram, {}).setdefault(length, []).append(row)
+                self.frequency[gram] += 1
+            self.grams.append(frozenset(grams))
+        self.needed: dict[int, dict[int, int]] = {}
+        """Bounds of every title length matched so far"""
+        self.scored = 0
+        """Number of `fuzz.ratio` calls made"""
+
+    def bounds(self, length: int) -> dict[int, int]:
+        """
+        Get the title lengths that can match a title, and the n-grams a
+        title of each length must share with it
+
+        :param length: length of the title to match
+        :type length: int
+        :return: least shared n-grams by title length
+        :rtype: dict[int, int]
+        """
+        needed = self.needed.get(length, None)
+        if needed is not None:
+            return needed
+        needed = self.needed[length] = {}
+        for other in self.by_length:
+            common = min_common(length, other, self.threshold)
+            if common is not None:
+                needed[other] = min_shared_grams(length, other, common, self.size)
+        return needed
+
+    def candidates(self, title: str) -> list[int]:
+        """
+        Get the rows of the titles that pass the length and n-gram bounds
+
+        A title sharing at least `least` of the `total` n-grams of the title
+        to match contains one of its `total - least + 1` rarest n-grams, so
+        only the postings of those are read. The titles found are then
+        checked against `least` by intersecting distinct n-grams, allowing
+        for the n-grams the title to match repeats.
+
+        :param title: title to match
+        :type title: str
+        :return: rows, in order
+        :rtype: list[int]
+        """
+        needed = self.bounds(len(title))
+        grams = title_grams(title, self.size)
+        total = sum(grams.values())
+        distinct = frozenset(grams)
+        repeated = total - len(grams)
+        found: dict[int, set[int]] = {other: set() for other, least in needed.items() if least > 0}
+        # read from the rarest n-gram up, `seen` counting the occurrences
+        # of the n-grams read before
+        seen = 0
+        for gram in sorted(grams, key=lambda gram: self.frequency.get(gram, 0)):
+            by_length = self.postings.get(gram, None)
+            if by_length is not None:
+                for other, rows in found.items():
+                    if seen <= total - needed[other]:
+                        rows.update(by_length.get(other, ()))
+            seen += grams[gram]
+        candidates: list[int] = []
+        for other, least in needed.items():
+            if least <= 0:
+                candidates.extend(self.by_length[other])
+                continue
+            # either title repeating an n-gram may share it more than once
+            least -= repeated
+            candidates.extend(
+                row for row in found[other] if len(distinct & self.grams[row]) >= least)
+        candidates.sort()
+        return candidates
+
+    def match(self, title: str) -> int | None:
+        """
+        Find the first title scoring the threshold, the same one scoring
+        every title in order would find
+
+        :param title: title to match
+        :type title: str
+        :return: row of the title, or None
+        :rtype: int | None
+        """
+        if not title:
+            return None
+        for row in self.candidates(title):
+            self.scored += 1
+            if fuzz.ratio(title, self.titles[row]) >= self.threshold:  # type: ignore
+                return row
+        return None
@@ -0,0 +1,24 @@
+# SPDX-License-Identifier: AGPL-3.0-only AND MIT
+
+"""
+Gunicorn settings, picked up when gunicorn runs from the repository root:
+
+    gunicorn api.index:app --workers 4
+
+The app and its database are loaded once in the master before workers fork,
+so every worker shares the same pages instead of building its own copy. Set
+ANIMEAPI_PRELOAD=0 to load in each worker instead.
+"""
+
+# pylint: disable=invalid-name
+
+import os
+
+preload_app = os.getenv("ANIMEAPI_PRELOAD", "1").lower() in ["1", "true", "yes"]
+
+
+def when_ready(server):  # pylint: disable=unused-argument
+    """Preload the database in the master, right before workers are forked"""
+    if preload_app:
+        from api.index import preload  # pylint: disable=import-outside-toplevel
+        preload()